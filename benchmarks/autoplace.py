@@ -0,0 +1,74 @@
+"""
+Measures Game.autoplace throughput on every preset for every autoplace strategy.
+Run from repository root: python -m benchmarks.autoplace [rounds]
+"""
+import random
+import sys
+import time
+
+from modules.core.game import Game
+from modules.core.autoplace import AUTOPLACE_STRATEGIES
+from modules.core.presets import PRESETS, get_preset
+
+from modules.common.exceptions import GameException
+
+
+def prepared_game(preset: str) -> Game:
+    """
+    Returns game with two players of given preset proceeded to setup state.
+    """
+    game = Game()
+    for name, color in (("Player", "blue"), ("Bot", "red")):
+        config = get_preset(preset)
+        game.set_player(name, color)
+        game.change_player_field(name, config["shape"], config["params"])
+        game.change_entity_list(name, config["entities"])
+    game.ready()
+    return game
+
+
+def measure(preset: str, rounds: int, strategy: str) -> dict:
+    placed, failed, skipped, elapsed = 0, 0, 0, 0.0
+    
+    for seed in range(rounds):
+        random.seed(seed)
+        try:
+            game = prepared_game(preset)
+        except GameException:
+            skipped += 1 # preset doesn't pass ready() check
+            continue
+        
+        for name in game.get_player_names():
+            start = time.perf_counter()
+            events, summary = game.autoplace(name, strategy, seed)
+            elapsed += time.perf_counter() - start
+            
+            placed += len(events)
+            if summary.startswith("Unable"):
+                failed += 1
+    
+    autoplaces = 2 * (rounds - skipped)
+    return {
+        "autoplaces": autoplaces,
+        "failed": failed,
+        "skipped": skipped,
+        "ms_per_autoplace": elapsed / autoplaces * 1000 if autoplaces else 0.0,
+        "entities_per_second": placed / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    
+    print(f"{'strategy':<11}{'preset':<15}{'autoplaces':>12}{'failed':>8}{'skipped':>9}{'ms/autoplace':>14}{'entities/s':>12}")
+    for strategy in AUTOPLACE_STRATEGIES:
+        for preset in PRESETS:
+            result = measure(preset, rounds, strategy)
+            print(
+                f"{strategy:<11}{preset:<15}{result['autoplaces']:>12}{result['failed']:>8}{result['skipped']:>9}"
+                f"{result['ms_per_autoplace']:>14.2f}{result['entities_per_second']:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
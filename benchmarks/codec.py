@@ -0,0 +1,127 @@
+"""
+Compares binary event codec with pickle and JSON on events of bot games:
+total size and encode/decode throughput.
+Run from repository root: python -m benchmarks.codec [games]
+"""
+import json
+import pickle
+import random
+import sys
+import time
+from enum import Enum
+
+from modules.core.game import Game
+from modules.core.bots import Randomer, Hunter
+from modules.core.presets import get_preset
+
+from modules.common.codec import encode_event, decode_event
+from modules.common.enums import GameState, CellStatus
+from modules.common.exceptions import GameException
+
+
+def played_game(seed: int, preset = "standart") -> Game:
+    """
+    Plays Randomer against Hunter on given preset till the end.
+    """
+    random.seed(seed)
+    game = Game()
+    for name, color in (("Player", "blue"), ("Bot", "red")):
+        config = get_preset(preset)
+        game.set_player(name, color)
+        game.change_player_field(name, config["shape"], config["params"])
+        game.change_entity_list(name, config["entities"])
+    game.ready()
+    for name in game.get_player_names():
+        game.autoplace(name, seed=seed)
+    game.start()
+
+    bots = {"Player": Randomer("Player"), "Bot": Hunter("Bot")}
+    for name, bot in bots.items():
+        opponent = "Bot" if name == "Player" else "Player"
+        bot.opponent_field = {coords: CellStatus.FREE for coords in game.get_player_meta(opponent)["real_cells"]}
+
+    while game.state != GameState.OVER:
+        name = game.whos_turn()
+        opponent = "Bot" if name == "Player" else "Player"
+        coords = bots[name].shoot()
+        if coords is None:
+            break
+
+        shooter_event, target_event = game.shoot(name, coords)
+        bots[name].shot_result(coords, target_event.shot_results[coords])
+        bots[name].validate_destruction(target_event.destroyed_cells)
+        for reflected, result in shooter_event.shot_results.items():
+            bots[opponent].shot_result(reflected, result)
+        bots[opponent].validate_destruction(shooter_event.destroyed_cells)
+    return game
+
+
+def jsonable(value):
+    """
+    Converts event fields to what json can store: enums to values, tuples and sets to lists, dict keys to strings.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(jsonable(key)): jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [jsonable(item) for item in value]
+    return value
+
+
+def json_encode(event) -> bytes:
+    fields = {name: jsonable(getattr(event, name)) for name in event.__dataclass_fields__}
+    return json.dumps({"kind": type(event).__name__, **fields}, separators=(",", ":")).encode()
+
+
+def pickle_encode(event) -> bytes:
+    return pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def measure(events: list, encode, decode) -> dict:
+    start = time.perf_counter()
+    records = [encode(event) for event in events]
+    encoding = time.perf_counter() - start
+
+    decoding = 0.0
+    if decode is not None:
+        start = time.perf_counter()
+        for record in records:
+            decode(record)
+        decoding = time.perf_counter() - start
+
+    return {
+        "bytes": sum(len(record) for record in records),
+        "encode": len(events) / encoding,
+        "decode": len(events) / decoding if decoding else 0.0,
+    }
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    events = []
+    for seed in range(games):
+        try:
+            events.extend(played_game(seed).events)
+        except GameException:
+            continue # autoplace failure
+
+    formats = (
+        ("codec", encode_event, decode_event),
+        ("pickle", pickle_encode, pickle.loads),
+        ("json", json_encode, json.loads), # json decoding gives plain dicts, not events
+    )
+
+    print(f"{len(events)} events of {games} games")
+    print(f"{'format':<8}{'bytes':>10}{'bytes/event':>13}{'encode/s':>11}{'decode/s':>11}")
+    for name, encode, decode in formats:
+        result = measure(events, encode, decode)
+        print(
+            f"{name:<8}{result['bytes']:>10}{result['bytes'] / len(events):>13.1f}"
+            f"{result['encode']:>11.0f}{result['decode']:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures field generation time for every supported shape across sizes:
+uncached - geometry is generated from scratch every time, cached - it's stamped from mask_cache.
+Run from repository root: python -m benchmarks.field_generation
+"""
+import timeit
+
+from modules.core.field import Field, mask_cache
+
+
+SHAPES = ("rectangle", "circle", "triangle", "rhombus", "pentagon", "hexagon", "heptagon")
+SIZES = (6, 12, 25, 50, 100)
+
+
+def shape_params(shape: str, size: int) -> list:
+    """
+    Rectangle takes [height, width], others take [radius, angle].
+    """
+    if shape == "rectangle":
+        return [2*size + 1, 2*size + 1]
+    return [size, 0]
+
+
+def measure(shape: str, size: int, cached: bool, repeat = 5) -> float:
+    """
+    Returns best of repeated generation time in milliseconds.
+    """
+    params = shape_params(shape, size)
+
+    def generate():
+        if not cached:
+            mask_cache.clear() # clearing costs nothing next to generation
+        Field(shape, params)
+
+    generate() # warms cache up for cached run
+    timer = timeit.Timer(generate)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1000
+
+
+def main():
+    header = f"{'shape':<10}" + "".join(f"{'r=' + str(size):>10}" for size in SIZES)
+    for cached in (False, True):
+        print(f"Field generation time ({'cached' if cached else 'uncached'}), ms")
+        print(header)
+        for shape in SHAPES:
+            print(f"{shape:<10}" + "".join(f"{measure(shape, size, cached):>10.3f}" for size in SIZES))
+        print()
+
+
+if __name__ == "__main__":
+    main()
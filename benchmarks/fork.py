@@ -0,0 +1,63 @@
+"""
+Compares Game.fork() with copy.deepcopy() on games in the middle of the play, alone and followed by a few shots.
+Run from repository root: python -m benchmarks.fork [repeats]
+"""
+import copy
+import sys
+import time
+
+from modules.core.replay import Replay
+from modules.core.game import SHOT_REACTION
+
+from benchmarks.codec import played_game
+
+
+SHOTS = 3 # shots made in every copy
+MIN_TURNS = 40 # too short games are skipped
+
+
+def per_call(function, repeats: int) -> float:
+    """
+    Returns microseconds per function call.
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    print(f"{'preset':<10}{'turn':>6}{'deepcopy':>12}{'fork':>10}{'+shots':>10}{'deepcopy+shots':>16}")
+    for preset in ("classic", "standart"):
+        seed = 0
+        played = played_game(seed, preset)
+        while played.turn < MIN_TURNS: # e.g. relays met in the same cells end the game in a turn
+            seed += 1
+            played = played_game(seed, preset)
+
+        replay = Replay(played.events)
+        turn = replay.turns // 2
+        game = replay.seek(turn)
+
+        # the same shots which were made in played game after that turn
+        shots = [
+            (event.shooter, event.coords) for event in played.events
+            if getattr(event, "turn", 0) > turn and event.shooter != SHOT_REACTION # type: ignore
+        ][:SHOTS]
+
+        def play(copied):
+            for shooter, coords in shots:
+                copied.shoot(shooter, coords)
+
+        deepcopied = per_call(lambda: copy.deepcopy(game), max(repeats // 20, 1))
+        forked = per_call(game.fork, repeats)
+        forked_shots = per_call(lambda: play(game.fork()), repeats)
+        deepcopied_shots = per_call(lambda: play(copy.deepcopy(game)), max(repeats // 20, 1))
+
+        print(f"{preset:<10}{turn:>6}{deepcopied:>10.0f}us{forked:>8.0f}us{forked_shots:>8.0f}us{deepcopied_shots:>14.0f}us")
+
+
+if __name__ == "__main__":
+    main()
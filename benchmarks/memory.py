@@ -0,0 +1,86 @@
+"""
+Measures memory taken by one cell view, entity and event with tracemalloc.
+Run from repository root: python -m benchmarks.memory [amount]
+"""
+import sys
+import tracemalloc
+
+from modules.core.field import Field, Cell
+from modules.core.entities import Ship, Planet, Relay
+
+from modules.common.events import ShotEvent, PlaceEvent, LobbyEvent
+from modules.common.enums import EntityType, GameState, EventType, LobbyEventType
+
+
+def bytes_per_object(factory, amount: int) -> float:
+    """
+    Creates amount of objects by factory and returns allocated bytes per object.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(number) for number in range(amount)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / amount
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    field = Field("rectangle", [100, 100])
+    cells_occupied = [(0, 0), (0, 1), (0, 2), (0, 3)]
+
+    def shot_event(number: int) -> ShotEvent:
+        return ShotEvent(
+            game_state=GameState.ACTIVE,
+            event_type=EventType.SHOT,
+            turn=number,
+            shooter="Player",
+            target="Bot",
+            coords=(number % 100, number // 100),
+            shot_results={},
+            planets_anchors=[],
+            destroyed_cells=[],
+        )
+
+    def place_event(number: int) -> PlaceEvent:
+        return PlaceEvent(
+            game_state=GameState.SETUP,
+            event_type=EventType.PLACE,
+            player_name="Player",
+            entity_id=number,
+            entity_type=EntityType.CRUISER,
+            anchor=(0, 0),
+            rotation=0,
+            cells_occupied=cells_occupied,
+        )
+
+    def lobby_event(number: int) -> LobbyEvent:
+        return LobbyEvent(
+            game_state=GameState.LOBBY,
+            event_type=EventType.LOBBY,
+            lobby_event=LobbyEventType.PLAYER_ADDED,
+            turn_order=[],
+            payload={},
+        )
+
+    # shared argument objects are created outside of measured factories, so only objects themselves are counted
+    cases = [
+        ("Cell", lambda number: Cell(field, number % 100, number // 100 % 100)),
+        ("Ship", lambda number: Ship(EntityType.CRUISER)),
+        ("Relay", lambda number: Relay()),
+        ("Planet r=3", lambda number: Planet(3, (5, 5), 1)),
+        ("ShotEvent", shot_event),
+        ("PlaceEvent", place_event),
+        ("LobbyEvent", lobby_event),
+    ]
+
+    print(f"{'object':<12}{'bytes':>10}")
+    for name, factory in cases:
+        print(f"{name:<12}{bytes_per_object(factory, amount):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures planets movement of planet_mayhem preset: per-planet loop Player.move_planets used before PlanetSystem
+against PlanetSystem python and numpy backends. Bigger systems are planet_mayhem systems repeated several times side by side.
+Run from repository root: python -m benchmarks.planets [turns]
+"""
+import copy
+import random
+import sys
+import time
+
+from modules.core.game import Game
+from modules.core.planets import PlanetSystem, HAS_NUMPY
+from modules.core.presets import get_preset
+
+from modules.common.enums import CellStatus, EntityType, EntityStatus
+
+
+def mayhem_planets(seed: int) -> list:
+    """
+    Returns planets of one planet_mayhem player placed by autoplace.
+    """
+    random.seed(seed)
+    game = Game()
+    config = get_preset("planet_mayhem")
+    for name, color in (("Player", "blue"), ("Bot", "red")):
+        game.set_player(name, color)
+        game.change_player_field(name, config["shape"], config["params"])
+        game.change_entity_list(name, config["entities"])
+    game.ready()
+    game.autoplace("Player", seed=seed)
+
+    player = game._get_player("Player")
+    return [entity for entity in player.entities.values() if entity.type == EntityType.PLANET]
+
+
+def shifted(planet, dy: int):
+    """
+    Returns copy of planet moved by dy rows, so copies of one system never collide with each other.
+    """
+    planet = copy.copy(planet)
+    planet.orbit_center = (planet.orbit_center[0] + dy, planet.orbit_center[1])
+    planet.orbit_cells = [(y + dy, x) for y, x in planet.orbit_cells]
+    planet.anchor = planet.orbit_cells[planet.position]
+    return planet
+
+
+def loop_move(planets: list, value = 1) -> dict:
+    """
+    Per-planet loop the way Player.move_planets did it before PlanetSystem.
+    """
+    updated_cells, groups = {}, {}
+    for planet in planets:
+        if planet.status == EntityStatus.DESTROYED:
+            continue
+        planet.position += value
+        updated_cells[planet.anchor[:]] = CellStatus.PLANET
+        groups.setdefault(planet.anchor[:], []).append(planet)
+
+    for anchor, group in groups.items():
+        if len(group) > 1:
+            updated_cells[anchor] = CellStatus.HIT
+            for planet in group:
+                planet.status = EntityStatus.DESTROYED
+    return updated_cells
+
+
+def measure(planets: list, turns: int, backend: str) -> float:
+    """
+    Returns microseconds per turn. Planets are copied, so every backend starts from the same state.
+    """
+    planets = copy.deepcopy(planets)
+    if backend == "loop":
+        move = lambda: loop_move(planets)
+    else:
+        system = PlanetSystem(planets, use_numpy=(backend == "numpy"))
+        move = system.step
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        move()
+    return (time.perf_counter() - start) / turns * 1_000_000
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    backends = ("loop", "python", "numpy") if HAS_NUMPY else ("loop", "python")
+    base = mayhem_planets(0)
+
+    print(f"{'planets':>8}" + "".join(f"{backend + ' us/turn':>18}" for backend in backends))
+    for copies in (1, 10, 100):
+        planets = [shifted(planet, 100 * number) for number in range(copies) for planet in base]
+        row = [measure(planets, turns, backend) for backend in backends]
+        print(f"{len(planets):>8}" + "".join(f"{value:>18.1f}" for value in row))
+
+    if not HAS_NUMPY:
+        print("numpy is not installed - numpy backend skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Plays headless bot-vs-bot games with Simulator and prints throughput and per-game statistics.
+Run from repository root: python -m benchmarks.simulation [games] [preset] [first bot] [second bot]
+"""
+import sys
+
+from modules.core.bots import BOTS
+from modules.core.simulator import Simulator, Contestant
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    preset = sys.argv[2] if len(sys.argv) > 2 else "classic"
+    first_bot = sys.argv[3] if len(sys.argv) > 3 else "randomer"
+    second_bot = sys.argv[4] if len(sys.argv) > 4 else "hunter"
+
+    first = Contestant.from_preset(first_bot.capitalize(), preset, BOTS[first_bot])
+    second = Contestant.from_preset(second_bot.capitalize() + ("-2" if first_bot == second_bot else ""), preset, BOTS[second_bot])
+    report = Simulator(first, second).run(games)
+
+    print(report.summary())
+    finished = report.finished
+    if not finished:
+        return
+
+    print(f"{'player':<12}{'shots':>8}{'hit rate':>10}{'cells lost':>12}")
+    for contestant in (first, second):
+        shots = sum(result.shots[contestant.name] for result in finished)
+        hits = sum(result.hits[contestant.name] for result in finished)
+        lost = sum(result.lost_cells[contestant.name] for result in finished)
+        print(f"{contestant.name:<12}{shots / len(finished):>8.1f}{hits / shots if shots else 0:>10.2f}{lost / len(finished):>12.1f}")
+
+    durations = sorted(result.duration for result in finished)
+    print(f"game time: median {durations[len(durations) // 2] * 1000:.1f}ms, max {durations[-1] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
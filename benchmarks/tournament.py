@@ -0,0 +1,34 @@
+"""
+Measures tournament throughput for growing amount of workers and prints aggregated results of the largest run.
+Run from repository root: python -m benchmarks.tournament [games] [preset] [max workers]
+"""
+import os
+import sys
+
+from modules.core.bots import Randomer, Hunter
+from modules.core.simulator import Simulator, Contestant
+from modules.core.tournament import Tournament
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    preset = sys.argv[2] if len(sys.argv) > 2 else "classic"
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+
+    simulator = Simulator(Contestant.from_preset("Randomer", preset, Randomer), Contestant.from_preset("Hunter", preset, Hunter))
+
+    print(f"{'workers':<8}{'games/s':>10}{'speedup':>10}")
+    single, stats = 0.0, None
+    workers = 1
+    while workers <= max_workers:
+        stats = Tournament(simulator, seed=0, workers=workers).run(games)
+        single = single or stats.games_per_second
+        print(f"{workers:<8}{stats.games_per_second:>10.1f}{stats.games_per_second / single:>10.2f}")
+        workers *= 2
+
+    if stats is not None:
+        print(stats.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ from cli.cli_terminal import STerminal
 from cli.cli_renderer import CLIRenderer
 
 from modules.core.game import Game
+from modules.core.presets import get_preset
 
-from modules.common.enums import EntityType
 from modules.common.exceptions import GameException, FieldException 
 
 
@@ -372,77 +372,8 @@ def preset(self, mode, flag = None, autoplay = None):
     self.r.set_player(player_name, options[player_name]["color"], player_ai)
     self.r.set_player(bot_name, options[bot_name]["color"], bot_ai)
 
-    match mode:
-        case "classic":
-            for name in options.keys():
-                options[name]["entities"] = {
-                    EntityType.CORVETTE: 4,
-                    EntityType.FRIGATE: 3,
-                    EntityType.DESTROYER: 2,
-                    EntityType.CRUISER: 1,
-                }
-                options[name]["shape"] = "1"
-                options[name]["params"] = ["10", "10"]
-        
-        case "standart":
-            for name in options.keys():
-                options[name]["entities"] = {
-                    EntityType.CORVETTE: 5,
-                    EntityType.FRIGATE: 4,
-                    EntityType.DESTROYER: 3,
-                    EntityType.CRUISER: 2,
-                    EntityType.RELAY: 7,
-                    EntityType.PLANET: 1,
-                }
-                options[name]["shape"] = "1"
-                options[name]["params"] = ["12", "12"]
-        
-        case "random":
-            for name in options.keys():
-                options[name]["entities"] = {
-                    EntityType.CORVETTE: random.randint(0, 10),
-                    EntityType.FRIGATE: random.randint(0, 8),
-                    EntityType.DESTROYER: random.randint(0, 5),
-                    EntityType.CRUISER: random.randint(0, 3),
-                    EntityType.RELAY: random.randint(0, 8),
-                    EntityType.PLANET: random.randint(0, 4),
-                }
-                options[name]["shape"] = str(random.choice((1, 2, 3, 4, 5, 6, 7)))
-                if options[name]["shape"] == "1":
-                    height = str(random.randint(10, 15))
-                    width = str(random.randint(10, 15))
-                else:
-                    height = str(random.randint(7, 10))
-                    width = str(random.randint(1, 360))
-                
-                options[name]["params"] = [height, width]
-
-        case "planet_mayhem":
-            for name in options.keys():
-                options[name]["entities"] = {
-                    EntityType.CORVETTE: 4,
-                    EntityType.FRIGATE: 0,
-                    EntityType.DESTROYER: 0,
-                    EntityType.CRUISER: 0,
-                    EntityType.RELAY: 0,
-                    EntityType.PLANET: 21,
-                }
-                options[name]["shape"] = "2"
-                options[name]["params"] = ["6", "0"]
-        
-        case "relay_madness":
-            for name in options.keys():
-                options[name]["entities"] = {
-                    EntityType.CORVETTE: 1,
-                    EntityType.FRIGATE: 0,
-                    EntityType.DESTROYER: 0,
-                    EntityType.CRUISER: 0,
-                    EntityType.RELAY: 40,
-                    EntityType.PLANET: 0,
-                }
-                options[name]["shape"] = "3"
-                options[name]["params"] = ["12", "145"]
-
+    for name in options.keys():
+        options[name].update(get_preset(mode))
     
     for name, config in options.items():
         self.r.set_player_field(name, config["shape"], config["params"])
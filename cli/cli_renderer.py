@@ -3,7 +3,7 @@ import logging
 from cli.cli_terminal import STerminal, CLIField, CLITalker
 
 from modules.core.game import Game
-from modules.core.bots import Randomer, Hunter
+from modules.core.bots import BOTS
 
 from modules.common.enums import CellStatus, EntityType
 from modules.common.utils import convert_input, invert_output
@@ -74,11 +74,8 @@ class CLIRenderer:
         player = self.players[name] = event.payload
         player["field"] = CLIField(self.term, player["real_cells"], player["height"], player["width"])
 
-        if ai is not None:
-            if ai == "randomer":
-                self.bots[name] = Randomer()
-            elif ai == "hunter":
-                self.bots[name] = Hunter()
+        if ai in BOTS:
+            self.bots[name] = BOTS[ai](name)
 
         self.talker.talk(f"<{self.term.paint(name, self.players[name]['color'])}> added")
 
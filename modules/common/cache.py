@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Bounded mapping which evicts least recently used entries when full.
+    maxsize=None - unbounded; maxsize=0 - caching disabled.
+    Counts hits, misses and evictions so cache efficiency can be watched.
+    """
+    def __init__(self, maxsize: Optional[int] = 128):
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns cached value and marks it as the most recently used one.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores value. Evicts least recently used entries if cache is full.
+        """
+        if self.maxsize == 0:
+            return
+        
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._evict()
+
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """
+        Changes cache bound. Evicts entries immediately if new bound is lower.
+        """
+        self.maxsize = maxsize
+        self._evict()
+
+
+    def clear(self) -> None:
+        """
+        Drops all entries and resets counters.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+    def _evict(self) -> None:
+        if self.maxsize is None:
+            return
+        
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self):
+        return f"LRUCache({self.info()})"
+
+
+class TranspositionTable:
+    """
+    Bounded table of search results keyed by 64-bit position hashes (see Game.zobrist()).
+    It has fixed amount of slots (size rounded up to power of two), key goes to slot key & (slots - 1).
+    Whole key is kept in slot, so other position with the same slot is a miss, not a wrong hit.
+    When slot is taken by other position eviction policy decides which one stays:
+    "depth" - new entry replaces old one if it was searched at least as deep (deeper results cost more to get again),
+    "always" - new entry always replaces old one (the latest results are the most relevant).
+    """
+    POLICIES = ("depth", "always")
+
+    def __init__(self, size = 1 << 16, policy = "depth"):
+        if size < 1:
+            raise ValueError(f"Transposition table size must be positive, not {size}")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy}. Use one of {self.POLICIES}")
+        
+        self.slots = 1 << (size - 1).bit_length()
+        self.policy = policy
+        self._mask = self.slots - 1
+        self._keys: list[Optional[int]] = [None] * self.slots
+        self._depths = [0] * self.slots
+        self._values: list[Any] = [None] * self.slots
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0 # entries replaced by other positions
+        self.rejections = 0 # entries not stored because of policy
+
+
+    def get(self, key: int, depth = 0, default: Any = None) -> Any:
+        """
+        Returns value stored for key if it was searched at least to given depth.
+        """
+        slot = key & self._mask
+        if self._keys[slot] == key and self._depths[slot] >= depth:
+            self.hits += 1
+            return self._values[slot]
+        
+        self.misses += 1
+        return default
+
+
+    def put(self, key: int, value: Any, depth = 0) -> bool:
+        """
+        Stores value searched to given depth. Returns False if policy kept other position in the slot.
+        """
+        slot = key & self._mask
+        stored = self._keys[slot]
+
+        if stored is None:
+            self._size += 1
+        elif stored != key:
+            if self.policy == "depth" and depth < self._depths[slot]:
+                self.rejections += 1
+                return False
+            self.evictions += 1
+        
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+        return True
+
+
+    def clear(self) -> None:
+        """
+        Drops all entries and resets counters.
+        """
+        self._keys = [None] * self.slots
+        self._depths = [0] * self.slots
+        self._values = [None] * self.slots
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+
+    def info(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+            "size": self._size,
+            "slots": self.slots,
+            "policy": self.policy,
+        }
+
+
+    def __contains__(self, key: int) -> bool:
+        return self._keys[key & self._mask] == key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        return f"TranspositionTable({self.info()})"
@@ -0,0 +1,451 @@
+"""
+Compact binary encoding of game events.
+
+Every event is a self-contained record, so it can be decoded alone (event store journal reads records by offset):
+    kind byte, game state, event type, then fields of the event kind in declaration order.
+Integers are varints (zigzag for signed), enums are their int values, strings are utf-8 with varint length.
+Typed fields which are always enums or ints are written without tags,
+everything else (payloads, optional fields) goes through tagged value encoding.
+Lists and tuples of (y, x) pairs are packed as deltas from the previous pair,
+so row of field cells takes 2 bytes per cell.
+Stream of records is framed by varint record length - see EventEncoder and EventDecoder.
+"""
+
+import struct
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from typing import Any, BinaryIO, Optional
+
+from modules.common.events import Event, ShotEvent, PlaceEvent, LobbyEvent
+from modules.common.enums import (
+    EntityStatus, EntityType, GameState, CellStatus, EventType, LobbyEventType, PlacementStatus, FeasibilityStatus
+)
+from modules.common.exceptions import CodecException
+
+
+# enum classes which can be met in payloads, index is written to the stream - only append new ones to the end
+ENUMS: tuple[type[Enum], ...] = (
+    EntityStatus, EntityType, GameState, CellStatus, EventType, LobbyEventType, PlacementStatus, FeasibilityStatus
+)
+_ENUM_IDS = {enum: number for number, enum in enumerate(ENUMS)}
+
+# event kinds
+_SHOT, _PLACE, _LOBBY = 0, 1, 2
+
+# value tags
+_NONE, _FALSE, _TRUE, _INT, _STR, _FLOAT, _LIST, _TUPLE, _DICT, _ENUM, _COORDS, _COORDS_LIST, _COORDS_TUPLE, _SET, _FROZENSET = range(15)
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _is_coords(value: Any) -> bool:
+    return type(value) is tuple and len(value) == 2 and type(value[0]) is int and type(value[1]) is int
+
+
+class _Writer:
+    """
+    Appends encoded primitives to bytearray.
+    """
+    __slots__ = ("buffer",)
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+
+    def uint(self, value: int) -> None:
+        if value < 0:
+            raise CodecException(f"Can't write negative {value} as unsigned varint")
+        buffer = self.buffer
+        while value > 0x7f:
+            buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+
+    def sint(self, value: int) -> None:
+        self.uint(value << 1 if value >= 0 else (-value << 1) - 1) # zigzag: 0, -1, 1, -2.. → 0, 1, 2, 3..
+
+
+    def text(self, value: str) -> None:
+        data = value.encode("utf-8")
+        self.uint(len(data))
+        self.buffer += data
+
+
+    def coords_sequence(self, values) -> None:
+        """
+        Writes (y, x) pairs as deltas from the previous pair starting from (0, 0).
+        """
+        self.uint(len(values))
+        previous_y, previous_x = 0, 0
+        for y, x in values:
+            self.sint(y - previous_y)
+            self.sint(x - previous_x)
+            previous_y, previous_x = y, x
+
+
+    def value(self, value: Any) -> None:
+        """
+        Writes tag and value of any supported type.
+        """
+        buffer = self.buffer
+        kind = type(value)
+
+        if value is None:
+            buffer.append(_NONE)
+        elif kind is bool:
+            buffer.append(_TRUE if value else _FALSE)
+        elif kind is int:
+            buffer.append(_INT)
+            self.sint(value)
+        elif kind is str:
+            buffer.append(_STR)
+            self.text(value)
+        elif kind is float:
+            buffer.append(_FLOAT)
+            buffer += _DOUBLE.pack(value)
+        elif isinstance(value, Enum):
+            enum_id = _ENUM_IDS.get(kind)
+            if enum_id is None:
+                raise CodecException(f"{kind} is not registered in codec ENUMS")
+            buffer.append(_ENUM)
+            buffer.append(enum_id)
+            self.sint(value.value)
+        elif _is_coords(value):
+            buffer.append(_COORDS)
+            self.sint(value[0])
+            self.sint(value[1])
+        elif kind is list or kind is tuple:
+            if value and all(_is_coords(item) for item in value):
+                buffer.append(_COORDS_LIST if kind is list else _COORDS_TUPLE)
+                self.coords_sequence(value)
+            else:
+                buffer.append(_LIST if kind is list else _TUPLE)
+                self.uint(len(value))
+                for item in value:
+                    self.value(item)
+        elif kind is dict:
+            buffer.append(_DICT)
+            self.uint(len(value))
+            for key, item in value.items():
+                self.value(key)
+                self.value(item)
+        elif kind is set or kind is frozenset:
+            buffer.append(_SET if kind is set else _FROZENSET)
+            self.uint(len(value))
+            for item in value:
+                self.value(item)
+        else:
+            raise CodecException(f"Can't encode {value!r} of {kind}")
+
+
+
+class _Reader:
+    """
+    Reads encoded primitives from bytes-like object.
+    """
+    __slots__ = ("data", "position")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+
+    def byte(self) -> int:
+        try:
+            value = self.data[self.position]
+        except IndexError:
+            raise CodecException("Unexpected end of event record")
+        self.position += 1
+        return value
+
+
+    def uint(self) -> int:
+        data, position = self.data, self.position
+        result, shift = 0, 0
+        try:
+            while True:
+                byte = data[position]
+                position += 1
+                result |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    self.position = position
+                    return result
+                shift += 7
+        except IndexError:
+            raise CodecException("Unexpected end of event record")
+
+
+    def sint(self) -> int:
+        value = self.uint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+    def text(self) -> str:
+        size = self.uint()
+        start = self.position
+        self.position += size
+        if self.position > len(self.data):
+            raise CodecException("Unexpected end of event record")
+        return bytes(self.data[start:self.position]).decode("utf-8")
+
+
+    def coords_sequence(self) -> list[tuple[int, int]]:
+        """
+        Deltas of neighbour cells are almost always single byte varints - they're decoded right here.
+        """
+        coords = []
+        y, x = 0, 0
+        amount = self.uint()
+        data, position = self.data, self.position
+        try:
+            for _ in range(amount):
+                byte = data[position]
+                if byte < 0x80:
+                    position += 1
+                    y += (byte >> 1) if not byte & 1 else -((byte + 1) >> 1)
+                else:
+                    self.position = position
+                    y += self.sint()
+                    position = self.position
+
+                byte = data[position]
+                if byte < 0x80:
+                    position += 1
+                    x += (byte >> 1) if not byte & 1 else -((byte + 1) >> 1)
+                else:
+                    self.position = position
+                    x += self.sint()
+                    position = self.position
+
+                coords.append((y, x))
+        except IndexError:
+            raise CodecException("Unexpected end of event record")
+
+        self.position = position
+        return coords
+
+
+    def value(self) -> Any:
+        tag = self.byte()
+
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _INT:
+            return self.sint()
+        if tag == _STR:
+            return self.text()
+        if tag == _FLOAT:
+            start = self.position
+            self.position += _DOUBLE.size
+            if self.position > len(self.data):
+                raise CodecException("Unexpected end of event record")
+            return _DOUBLE.unpack_from(self.data, start)[0]
+        if tag == _ENUM:
+            enum_id = self.byte()
+            if enum_id >= len(ENUMS):
+                raise CodecException(f"Unknown enum id {enum_id}")
+            return ENUMS[enum_id](self.sint())
+        if tag == _COORDS:
+            return (self.sint(), self.sint())
+        if tag == _COORDS_LIST:
+            return self.coords_sequence()
+        if tag == _COORDS_TUPLE:
+            return tuple(self.coords_sequence())
+        if tag in (_LIST, _TUPLE, _SET, _FROZENSET):
+            items = [self.value() for _ in range(self.uint())]
+            if tag == _LIST:
+                return items
+            if tag == _TUPLE:
+                return tuple(items)
+            return set(items) if tag == _SET else frozenset(items)
+        if tag == _DICT:
+            result = {}
+            for _ in range(self.uint()):
+                key = self.value()
+                result[key] = self.value()
+            return result
+
+        raise CodecException(f"Unknown value tag {tag}")
+
+
+
+def encode_event(event: Event) -> bytes:
+    """
+    Returns binary record of ShotEvent, PlaceEvent or LobbyEvent.
+    """
+    writer = _Writer()
+
+    if isinstance(event, ShotEvent):
+        writer.buffer.append(_SHOT)
+        writer.uint(event.game_state.value)
+        writer.uint(event.event_type.value)
+        writer.uint(event.turn)
+        writer.text(event.shooter)
+        writer.text(event.target)
+        writer.value(event.coords)
+        # {coords: CellStatus} - coords packed as one sequence, statuses go after it
+        writer.coords_sequence(list(event.shot_results.keys()))
+        for status in event.shot_results.values():
+            writer.uint(status.value)
+        writer.value(event.planets_anchors)
+        writer.value(event.destroyed_cells)
+
+    elif isinstance(event, PlaceEvent):
+        writer.buffer.append(_PLACE)
+        writer.uint(event.game_state.value)
+        writer.uint(event.event_type.value)
+        writer.text(event.player_name)
+        writer.sint(event.entity_id)
+        writer.uint(event.entity_type.value)
+        writer.value(event.anchor)
+        writer.value(event.rotation)
+        writer.value(event.cells_occupied)
+        writer.value(event.radius)
+        writer.value(event.orbit_cells)
+        writer.value(event.orbit_center)
+
+    elif isinstance(event, LobbyEvent):
+        writer.buffer.append(_LOBBY)
+        writer.uint(event.game_state.value)
+        writer.uint(event.event_type.value)
+        writer.uint(event.lobby_event.value)
+        writer.value(event.turn_order)
+        writer.value(event.payload)
+        writer.value(event.player_1)
+        writer.value(event.player_2)
+        writer.value(event.winner)
+
+    else:
+        raise CodecException(f"Can't encode event of {type(event)}")
+
+    return bytes(writer.buffer)
+
+
+def decode_event(data: bytes) -> Event:
+    """
+    Restores event from binary record made by encode_event().
+    """
+    reader = _Reader(memoryview(data))
+    kind = reader.byte()
+    game_state = GameState(reader.uint())
+    event_type = EventType(reader.uint())
+
+    if kind == _SHOT:
+        turn = reader.uint()
+        shooter = reader.text()
+        target = reader.text()
+        coords = reader.value()
+        shot_coords = reader.coords_sequence()
+        shot_results = {yx: CellStatus(reader.uint()) for yx in shot_coords}
+        return ShotEvent(
+            game_state=game_state,
+            event_type=event_type,
+            turn=turn,
+            shooter=shooter,
+            target=target,
+            coords=coords,
+            shot_results=shot_results,
+            planets_anchors=reader.value(),
+            destroyed_cells=reader.value(),
+        )
+
+    if kind == _PLACE:
+        return PlaceEvent(
+            game_state=game_state,
+            event_type=event_type,
+            player_name=reader.text(),
+            entity_id=reader.sint(),
+            entity_type=EntityType(reader.uint()),
+            anchor=reader.value(),
+            rotation=reader.value(),
+            cells_occupied=reader.value(),
+            radius=reader.value(),
+            orbit_cells=reader.value(),
+            orbit_center=reader.value(),
+        )
+
+    if kind == _LOBBY:
+        return LobbyEvent(
+            game_state=game_state,
+            event_type=event_type,
+            lobby_event=LobbyEventType(reader.uint()),
+            turn_order=reader.value(),
+            payload=reader.value(),
+            player_1=reader.value(),
+            player_2=reader.value(),
+            winner=reader.value(),
+        )
+
+    raise CodecException(f"Unknown event kind {kind}")
+
+
+
+class EventEncoder:
+    """
+    Streaming encoder. Writes every event to binary stream as varint length and encoded record.
+    """
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.written = 0 # bytes
+
+
+    def write(self, event: Event) -> int:
+        """
+        Writes one event and returns amount of bytes written.
+        """
+        record = encode_event(event)
+        header = _Writer()
+        header.uint(len(record))
+
+        self.stream.write(header.buffer)
+        self.stream.write(record)
+
+        size = len(header.buffer) + len(record)
+        self.written += size
+        return size
+
+
+    def write_many(self, events: Iterable[Event]) -> int:
+        return sum(self.write(event) for event in events)
+
+
+
+class EventDecoder:
+    """
+    Streaming decoder of what EventEncoder wrote. Reads records one by one, so the whole stream is never in memory.
+    Iterating yields events until the end of the stream.
+    """
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+
+    def read(self) -> Optional[Event]:
+        """
+        Returns next event or None at the end of the stream.
+        """
+        size, shift = 0, 0
+        while True:
+            byte = self.stream.read(1)
+            if not byte:
+                if shift:
+                    raise CodecException("Stream ends inside record length")
+                return None
+            size |= (byte[0] & 0x7f) << shift
+            if byte[0] < 0x80:
+                break
+            shift += 7
+
+        record = self.stream.read(size)
+        if len(record) != size:
+            raise CodecException(f"Stream ends inside record: {len(record)} of {size} bytes")
+        return decode_event(record)
+
+
+    def __iter__(self) -> Iterator[Event]:
+        while (event := self.read()) is not None:
+            yield event
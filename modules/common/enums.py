@@ -51,4 +51,27 @@ class LobbyEventType(Enum):
     STATE_CHANGED = 0
     PLAYER_ADDED = 1
     PLAYER_DELETED = 2
-    PLAYER_CHANGED = 3
\ No newline at end of file
+    PLAYER_CHANGED = 3
+
+
+class PlacementStatus(Enum):
+    """
+    Result of placement probe. Tells why entity can't be placed.
+    """
+    OK = 0
+    NO_FIELD = 1
+    OUT_OF_BOUNDS = 2
+    VOID = 3
+    OCCUPIED = 4
+    TOO_CLOSE = 5 # ship or relay in neighbour cells
+    NO_CROSSING = 6 # planet orbit never crosses any field cell
+    UNSUPPORTED = 7
+
+
+class FeasibilityStatus(Enum):
+    """
+    Result of fleet feasibility check.
+    """
+    FITS = 1
+    DOESNT_FIT = 2
+    UNKNOWN = 3 # exact check ran out of time
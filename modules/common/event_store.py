@@ -0,0 +1,314 @@
+import logging
+import tempfile
+import weakref
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, Optional
+
+from modules.common.events import Event
+from modules.common.codec import encode_event, decode_event
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventStore(ABC):
+    """
+    Append-only sequence of game events. Event number is it's index - position in history.
+    Supports len(), iteration over full history, store[index] and store[start:stop] reading.
+    Only truncate() takes events back. Forks read their history from this store, so it copies events
+    which forks still need before dropping them.
+    """
+    def __init__(self):
+        self._forks: weakref.WeakSet[ForkEventStore] = weakref.WeakSet() # live forks reading from this store
+
+
+    @abstractmethod
+    def append(self, event: Event) -> int:
+        """
+        Stores event and returns it's index.
+        """
+        pass
+
+
+    @abstractmethod
+    def get(self, index: int) -> Event:
+        pass
+
+
+    def range(self, start: int, stop: Optional[int] = None) -> Iterator[Event]:
+        """
+        Lazily yields events with indexes from start up to stop (not included). stop=None - until the end.
+        """
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        for index in range(max(start, 0), stop):
+            yield self.get(index)
+
+
+    def truncate(self, length: int) -> None:
+        """
+        Drops events with indexes from length on. Used to take moves back (see Game.undo()).
+        """
+        length = max(length, 0)
+        for fork in list(self._forks):
+            fork._detach(length)
+        self._truncate(length)
+
+
+    @abstractmethod
+    def _truncate(self, length: int) -> None:
+        pass
+
+
+    def close(self) -> None:
+        pass
+
+
+    def _normalize(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"Event index {index} out of range of {length} events")
+        return index
+
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def __iter__(self) -> Iterator[Event]:
+        return self.range(0)
+
+    def __getitem__(self, key: int | slice) -> Event | list[Event]:
+        if isinstance(key, slice):
+            return [self.get(index) for index in range(*key.indices(len(self)))]
+        return self.get(key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+
+class MemoryEventStore(EventStore):
+    """
+    Keeps whole history in memory list. Default store - fine for regular games.
+    """
+    def __init__(self, events: Iterable[Event] = ()):
+        super().__init__()
+        self._events: list[Event] = list(events)
+
+
+    def append(self, event: Event) -> int:
+        self._events.append(event)
+        return len(self._events) - 1
+
+
+    def get(self, index: int) -> Event:
+        return self._events[self._normalize(index)]
+
+
+    def range(self, start: int, stop: Optional[int] = None) -> Iterator[Event]:
+        return iter(self._events[max(start, 0):stop])
+
+
+    def _truncate(self, length: int) -> None:
+        del self._events[length:]
+
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+
+class ForkEventStore(EventStore):
+    """
+    History of forked game. Events before fork are read from parent store, events after fork are kept in memory list.
+    Forking costs nothing whatever parent history length is. If parent is truncated below fork point (e.g. by Game.undo()),
+    events this history still needs are copied into the list first.
+    length - amount of parent's first events which belong to this history, whole parent history by default.
+    """
+    def __init__(self, parent: EventStore, length: Optional[int] = None):
+        super().__init__()
+        self.parent = parent
+        self._base = len(parent) if length is None else max(0, min(length, len(parent))) # events of parent which belong to this history
+        self._events: list[Event] = []
+        parent._forks.add(self)
+
+
+    def append(self, event: Event) -> int:
+        self._events.append(event)
+        return self._base + len(self._events) - 1
+
+
+    def get(self, index: int) -> Event:
+        index = self._normalize(index)
+        if index < self._base:
+            return self.parent.get(index)
+        return self._events[index - self._base]
+
+
+    def range(self, start: int, stop: Optional[int] = None) -> Iterator[Event]:
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = max(start, 0)
+        if start < self._base:
+            yield from self.parent.range(start, min(stop, self._base))
+        yield from self._events[max(start - self._base, 0):max(stop - self._base, 0)]
+
+
+    def _detach(self, length: int) -> None:
+        """
+        Parent is going to drop events from length on: ones which belong to this history are copied.
+        """
+        if length < self._base:
+            self._events[:0] = self.parent.range(length, self._base)
+            self._base = length
+
+
+    def _truncate(self, length: int) -> None:
+        """
+        Parent history is never changed: truncating into it just makes it's later events not a part of this one.
+        """
+        if length < self._base:
+            self._base = length
+            self._events.clear()
+        else:
+            del self._events[length - self._base:]
+
+
+    def __len__(self) -> int:
+        return self._base + len(self._events)
+
+
+
+class JournalEventStore(EventStore):
+    """
+    Keeps only the latest `capacity` events in memory ring buffer.
+    Older events are spilled to append-only journal file and read back from it on demand.
+    Journal record is binary encoded event (see codec) prefixed by it's length; file offsets of records are kept in memory (8 bytes per event)
+    so any event is one seek away. Without path journal is anonymous temporary file removed on close().
+    """
+    def __init__(self, path: Optional[str] = None, capacity = 1024):
+        if capacity < 1:
+            raise ValueError(f"Event store capacity must be positive, not {capacity}")
+
+        super().__init__()
+        self.capacity = capacity
+        self.path = path
+        self._ring: list[Optional[Event]] = [None] * capacity # event with index i is in slot i % capacity
+        self._length = 0
+
+        self._journal: BinaryIO = open(path, "w+b") if path is not None else tempfile.TemporaryFile() # type: ignore
+        self._offsets = array("q") # journal offset of every spilled event
+        self._journal_end = 0
+
+
+    @property
+    def spilled(self) -> int:
+        """
+        Amount of events which are only in journal.
+        """
+        return len(self._offsets)
+
+
+    def append(self, event: Event) -> int:
+        index = self._length
+        slot = index % self.capacity
+
+        if index >= self.capacity: # ring is full - the oldest event goes to journal
+            self._spill(self._ring[slot]) # type: ignore
+
+        self._ring[slot] = event
+        self._length += 1
+        return index
+
+
+    def _spill(self, event: Event) -> None:
+        record = encode_event(event)
+
+        self._journal.seek(self._journal_end)
+        self._journal.write(len(record).to_bytes(4, "little"))
+        self._journal.write(record)
+
+        self._offsets.append(self._journal_end)
+        self._journal_end += 4 + len(record)
+
+
+    def _read_spilled(self, index: int) -> Event:
+        self._journal.flush()
+        self._journal.seek(self._offsets[index])
+        size = int.from_bytes(self._journal.read(4), "little")
+        return decode_event(self._journal.read(size))
+
+
+    def get(self, index: int) -> Event:
+        index = self._normalize(index)
+        if index < self.spilled:
+            return self._read_spilled(index)
+        return self._ring[index % self.capacity] # type: ignore
+
+
+    def range(self, start: int, stop: Optional[int] = None) -> Iterator[Event]:
+        """
+        Reads spilled part of range from journal sequentially, the rest comes from ring buffer.
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        index = max(start, 0)
+
+        while index < stop:
+            spilled = self.spilled
+            if index >= spilled:
+                yield self._ring[index % self.capacity] # type: ignore
+                index += 1
+                continue
+
+            # spilled records go one after another, so next offset is known without offsets lookup
+            self._journal.flush()
+            position = self._offsets[index]
+            while index < min(stop, spilled):
+                self._journal.seek(position)
+                size = int.from_bytes(self._journal.read(4), "little")
+                event = decode_event(self._journal.read(size))
+                position += 4 + size
+                index += 1
+                yield event # caller may append events while iterating and move file position, so it's sought every time
+
+
+    def _truncate(self, length: int) -> None:
+        """
+        Events which get back into the ring buffer window are read from journal, journal is cut after them.
+        """
+        if length >= self._length:
+            return
+
+        kept_spilled = max(length - self.capacity, 0)
+        restored = list(self.range(kept_spilled, min(self.spilled, length)))
+
+        for index in range(length, self._length):
+            self._ring[index % self.capacity] = None
+        for index, event in enumerate(restored, start=kept_spilled):
+            self._ring[index % self.capacity] = event
+
+        if kept_spilled < self.spilled:
+            self._journal_end = self._offsets[kept_spilled]
+            del self._offsets[kept_spilled:]
+            self._journal.truncate(self._journal_end)
+        self._length = length
+
+
+    def close(self) -> None:
+        """
+        Closes journal. Store can't be used after that.
+        """
+        if not self._journal.closed:
+            self._journal.close()
+            logger.debug(f"Event journal {self.path} closed with {self._length} events")
+
+
+    def __len__(self) -> int:
+        return self._length
@@ -4,15 +4,16 @@ from typing import Optional, Iterable
 from modules.common.enums import EntityType, CellStatus, GameState, EventType, LobbyEventType
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Event:
     """
-    Base event class
+    Base event class.
+    Events are records of what already happened, so they're immutable and slotted - games keep a lot of them.
     """
     game_state: GameState
     event_type: EventType
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ShotEvent(Event):
     turn: int
     shooter: str
@@ -20,9 +21,9 @@ class ShotEvent(Event):
     coords: tuple
     shot_results: dict[tuple[int, int], CellStatus]
     planets_anchors: list[tuple[int, int]]
-    destroyed_cells: list[tuple[int, int]]
+    destroyed_cells: list[tuple[int, int]] # only cells of entities destroyed by this shot, see Game.get_destroyed_cells()
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LobbyEvent(Event):
     lobby_event: LobbyEventType
     turn_order: list[str]
@@ -31,7 +32,7 @@ class LobbyEvent(Event):
     player_2: Optional[str] = None
     winner: Optional[str] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlaceEvent(Event):
     player_name: str
     entity_id: int
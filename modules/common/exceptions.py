@@ -11,4 +11,8 @@ class PlayerException(Exception):
 
 
 class GameException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class CodecException(Exception):
+    pass
@@ -1,6 +1,12 @@
 from collections.abc import Iterable
 from math import sin, cos, atan2, pi, ceil
 
+from modules.common.cache import LRUCache
+
+
+# {radius: orbit offsets}
+orbit_cache = LRUCache(maxsize=256)
+
 
 def convert_input(coords: str) -> tuple[int, int]:
     """
@@ -93,6 +99,70 @@ def sort_circle_coords(center: tuple[int, int], coords: Iterable[tuple[int, int]
     return [point for angle, point in points_with_angles] 
 
 
+def orbit_offsets(radius: int) -> tuple[tuple[int, int], ...]:
+    """
+    Returns (dy, dx) offsets of circle with given radius around (0, 0) sorted by angle,
+    same as circle_coords() sorted by sort_circle_coords(), but without any trigonometry.
+    Bresenham walk of the first octant already goes by growing angle,
+    other octants are its mirrors and quarter turns. Results are cached by radius.
+    """
+    offsets = orbit_cache.get(radius)
+    if offsets is not None:
+        return offsets
+    
+    if radius == 0:
+        offsets = ((0, 0),)
+        orbit_cache.put(radius, offsets)
+        return offsets
+
+    octant = [] # (dy, dx) with 0 <= dy <= dx - angles from 0 to 45 degrees
+    x = 0
+    y = radius
+    d = 1 - radius
+    while x <= y:
+        octant.append((x, y))
+        if d < 0:
+            d += 2 * x + 3
+        else:
+            d += 2 * (x - y) + 5
+            y -= 1
+        x += 1
+
+    # angles from 45 degrees to 90 are mirrored octant walked backwards, diagonal and 90 degrees cells are taken once
+    quarter = octant + [(dx, dy) for dy, dx in reversed(octant) if 0 < dy < dx]
+
+    offsets = tuple(quarter) # each next quarter is previous one turned by 90 degrees: (dy, dx) → (dx, -dy)
+    offsets += tuple((dx, -dy) for dy, dx in quarter)
+    offsets += tuple((-dy, -dx) for dy, dx in quarter)
+    offsets += tuple((-dx, dy) for dy, dx in quarter)
+
+    orbit_cache.put(radius, offsets)
+    return offsets
+
+
+def clip_orbit(center: tuple[int, int], radius: int, height: int, width: int, void) -> tuple[list[int], int]:
+    """
+    Intersects orbit with given center and radius with height x width field which void flags are given flat.
+    Returns (flat indexes y*width + x of orbit cells inside field in orbit order, amount of them which are not void).
+    Orbit bounding box is checked first, so orbits fully inside or fully outside field skip per cell bounds checks.
+    """
+    y0, x0 = center
+    if y0 + radius < 0 or y0 - radius >= height or x0 + radius < 0 or x0 - radius >= width:
+        return ([], 0)
+    
+    offsets = orbit_offsets(radius)
+    if 0 <= y0 - radius and y0 + radius < height and 0 <= x0 - radius and x0 + radius < width:
+        indexes = [(y0 + dy) * width + x0 + dx for dy, dx in offsets]
+    else:
+        indexes = [
+            (y0 + dy) * width + x0 + dx for dy, dx in offsets
+            if 0 <= y0 + dy < height and 0 <= x0 + dx < width
+        ]
+    
+    real_cells = len(indexes) - sum(void[index] for index in indexes)
+    return (indexes, real_cells)
+
+
 def ngon_coords(*, n: int, radius: int, center = (0, 0), angle = 0.0) -> list[tuple[int, int]]:
     """
     Uses Bresenghem algorithm to draw polygon border with given radius, center and angle.
@@ -138,4 +208,27 @@ def ngon_coords(*, n: int, radius: int, center = (0, 0), angle = 0.0) -> list[tu
                 err += dx
                 y1 += sy
 
-    return list(coords) 
\ No newline at end of file
+    return list(coords)
+
+
+def scanline_bounds(coords: Iterable[tuple[int, int]], height: int, width: int) -> list[tuple[int, int] | None]:
+    """
+    Scanline rasterizer helper.
+    Returns for every row of height x width rectangle (leftmost x, rightmost x) of given border coords.
+    Row which border never crosses gets None.
+    """
+    bounds: list[tuple[int, int] | None] = [None] * max(height, 0)
+
+    for y, x in coords:
+        if not (0 <= y < height and 0 <= x < width):
+            continue
+        
+        row = bounds[y]
+        if row is None:
+            bounds[y] = (x, x)
+        elif x < row[0]:
+            bounds[y] = (x, row[1])
+        elif x > row[1]:
+            bounds[y] = (row[0], x)
+    
+    return bounds
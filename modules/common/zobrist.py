@@ -0,0 +1,51 @@
+"""
+Zobrist hashing of game positions.
+Every (status, y, x) fact - cell shot with given result, planet standing on a cell - has it's own pseudo-random 64-bit key,
+position hash is XOR of keys of all facts true in it. So adding or removing one fact is one XOR,
+and the same position reached by different moves has the same hash.
+Keys are derived by splitmix64 from the fact itself, so they're the same in every process and need no tables for any field size.
+"""
+from modules.common.enums import CellStatus
+
+
+MASK_64 = (1 << 64) - 1
+_COORDS_BITS = 24 # per coordinate, off-field planet anchors may be negative so coords are taken modulo 2**24
+
+_keys: dict[tuple[int, int, int], int] = {} # {(kind, y, x): key} - keys are cheap to compute, but dict lookup is cheaper
+
+
+def splitmix64(value: int) -> int:
+    """
+    One step of splitmix64 generator: well mixed 64-bit output for given 64-bit input.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def zobrist_key(status: CellStatus, coords: tuple[int, int]) -> int:
+    """
+    Key of fact "cell (y, x) has given status": shot result for shot cells, CellStatus.PLANET for planet positions.
+    """
+    y, x = coords
+    kind = status.value
+    try:
+        return _keys[(kind, y, x)]
+    except KeyError:
+        mask = (1 << _COORDS_BITS) - 1
+        key = splitmix64((kind << 2 * _COORDS_BITS) | ((y & mask) << _COORDS_BITS) | (x & mask))
+        _keys[(kind, y, x)] = key
+        return key
+
+
+def rotate_left(value: int, bits = 1) -> int:
+    """
+    Rotates 64-bit value. Makes hash of the same facts different when they belong to opponent.
+    """
+    return ((value << bits) | (value >> (64 - bits))) & MASK_64
+
+
+# facts which are not about cells
+SIDE_TO_MOVE = splitmix64(0x5155) # hash owner shoots next
+TURN_PARITY = splitmix64(0x7A1E) # odd turn
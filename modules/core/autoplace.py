@@ -0,0 +1,355 @@
+import logging
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from time import monotonic
+from typing import Optional
+
+from modules.core.placement import PlacementIndex, ENTITY_SIZES, MAX_ENTITY_SIZE, DIRECTIONS
+
+from modules.common.enums import EntityType
+from modules.common.utils import clip_orbit, orbit_offsets
+
+
+logger = logging.getLogger(__name__)
+
+AUTOPLACE_STRATEGIES = ("backtrack", "random")
+
+# {size: regex} finds every cell where run of free cells is long enough for entity of this size
+_FITTING_RUNS = {
+    size: re.compile(b"[" + re.escape(bytes([size])) + b"-" + re.escape(bytes([MAX_ENTITY_SIZE])) + b"]")
+    for size in range(1, MAX_ENTITY_SIZE + 1)
+}
+# {size: translation table} turns runs into 1 where entity of this size fits and 0 where it doesn't
+_FITS_TABLES = {
+    size: bytes(1 if run >= size else 0 for run in range(256))
+    for size in range(1, MAX_ENTITY_SIZE + 1)
+}
+
+
+class LayoutSolver:
+    """
+    Finds complete layout for pending entities before anything is placed on the real field.
+    Planets are placed first by random sampling - same as players do, so their orbits look natural.
+    Ships and relays are placed by depth-first search over currently legal placements:
+    on every step it picks entity size with the least legal placements left (most constrained first)
+    and tries its placements in random order. Search backtracks on dead ends,
+    and when backtracks limit is reached - restarts with new planets layout.
+    With max_backtracks=None search is exhaustive: if it ends without layout - ships and relays can't fit at all.
+    ordered=True tries placements in index order and places entities of the same size only in ascending order,
+    so every set of placements is visited once instead of once per permutation. That's for exhaustive search -
+    autoplace keeps it off so layouts stay random.
+    time_limit (seconds) bounds the whole solve() call.
+    Works only with plain data (mask and placement index) so it can be run in another process.
+    """
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        void: bytes,
+        index: PlacementIndex,
+        pending: dict[EntityType, int],
+        *,
+        seed: Optional[int] = None,
+        max_backtracks: Optional[int] = 2000,
+        max_restarts = 20,
+        planet_attempts = 1000,
+        time_limit: Optional[float] = None,
+        ordered = False,
+    ):
+        self.height, self.width = height, width
+        self.void = void
+        self.index = index
+        self.pending = {etype: amount for etype, amount in pending.items() if amount > 0}
+
+        self.rng = random.Random(seed)
+        self.max_backtracks = max_backtracks
+        self.max_restarts = max_restarts
+        self.planet_attempts = planet_attempts
+        self.time_limit = time_limit
+        self.ordered = ordered
+        self._deadline: Optional[float] = None
+
+        # search statistics
+        self.steps = 0
+        self.backtracks = 0
+        self.restarts = 0
+        self.timed_out = False
+        self.exhausted = False # every ships placement was tried for the last planets layout
+
+
+    @classmethod
+    def from_field(cls, field, pending: dict[EntityType, int], **kwargs) -> "LayoutSolver":
+        return cls(
+            field.dimensions["height"],
+            field.dimensions["width"],
+            field.void_mask,
+            field.placement.copy(),
+            pending,
+            **kwargs
+        )
+
+
+    def solve(self) -> Optional[list[tuple]]:
+        """
+        Returns list of (entity type, anchor, r) in order they must be placed
+        where r is rotation for ships and relays and orbit radius for planets.
+        Planets go first as (EntityType.PLANET, center, radius, rotation, position) - their motion is seeded too.
+        Returns None if no layout found within limits.
+        """
+        self._deadline = None if self.time_limit is None else monotonic() + self.time_limit
+        
+        for attempt in range(self.max_restarts):
+            if attempt:
+                self.restarts += 1
+
+            index = self.index.copy()
+            planets = self._place_planets(index)
+            if planets is None:
+                return None # orbit that crosses the field is not found - there's no point to retry
+
+            ships = self._place_ships(index)
+            if ships is not None:
+                return planets + ships
+            
+            if self.timed_out or (self.exhausted and not planets):
+                break # new attempt without new planets layout would give the same result
+
+        logger.info(f"No layout found for {self.pending}: {self.restarts} restarts, {self.backtracks} backtracks")
+        return None
+
+
+    def solve_parallel(self, workers: int, timeout: Optional[float] = None) -> Optional[list[tuple]]:
+        """
+        Runs independently seeded copies of this solver in process pool.
+        Seeds of copies are derived from this solver's seed, and layout of the lowest numbered copy which found one is returned,
+        so result doesn't depend on which copy finishes first. It's returned as soon as all copies before it have failed.
+        Returns None if no copy found layout. When timeout (seconds) is reached the lowest numbered layout found so far is returned -
+        such result depends on timing.
+        """
+        seeds = [self.rng.getrandbits(64) for _ in range(workers)]
+        deadline = None if timeout is None else monotonic() + timeout
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(_solve_with_seed, self, seed) for seed in seeds]
+            numbers = {future: number for number, future in enumerate(futures)}
+            layouts: list[Optional[list[tuple]]] = [None] * workers
+            finished = [False] * workers
+
+            pending = set(futures)
+            while pending:
+                remaining = None if deadline is None else max(deadline - monotonic(), 0)
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.info(f"Parallel layout search for {self.pending} timed out after {timeout}s")
+                    self.timed_out = True
+                    return next((layout for layout in layouts if layout is not None), None)
+
+                for future in done:
+                    layout, steps, backtracks, restarts = future.result()
+                    self.steps += steps
+                    self.backtracks += backtracks
+                    self.restarts += restarts
+                    layouts[numbers[future]] = layout
+                    finished[numbers[future]] = True
+
+                for number in range(workers):
+                    if not finished[number]:
+                        break # copy before the found layouts may find it's own yet
+                    if layouts[number] is not None:
+                        return layouts[number]
+            return None
+        finally:
+            # searches are bounded by backtracks and restarts limits, so running ones are left to finish on their own
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+    def _place_planets(self, index: PlacementIndex) -> Optional[list[tuple[EntityType, tuple[int, int], int, int, int]]]:
+        """
+        Samples orbits same way as random autoplace does. Takes orbit cells away from index.
+        """
+        height, width = self.height, self.width
+        max_radius = max(3, int(max(height, width)/2))
+
+        planets = []
+        for _ in range(self.pending.get(EntityType.PLANET, 0)):
+            for _ in range(self.planet_attempts):
+                center = (self.rng.randint(0, height - 1), self.rng.randint(0, width - 1))
+                radius = self.rng.randint(3, max_radius)
+
+                orbit_indexes, real_cells = clip_orbit(center, radius, height, width, self.void)
+                if not real_cells:
+                    continue # orbit never crosses real cells
+
+                index.occupy(orbit_indexes, halo=False)
+                planets.append((EntityType.PLANET, center, radius, self.rng.choice((1, -1)), self.rng.randrange(len(orbit_offsets(radius)))))
+                break
+            else:
+                return None
+        return planets
+
+
+    def _candidates(self, index: PlacementIndex, size: int, after = -1) -> list[tuple[int, int]]:
+        """
+        Returns all unique (flat anchor index, rotation) placements for entity of given size
+        which key (rotation * cells + anchor index) is greater than after.
+        Rotations 2 and 3 are mirrors of 0 and 1, and 1-tiled entity doesn't need rotation at all.
+        """
+        rotations = (0,) if size == 1 else (0, 1)
+        pattern = _FITTING_RUNS[size]
+        cells = len(index.free)
+
+        candidates = []
+        for rotation in rotations:
+            start = after + 1 - rotation * cells
+            if start < cells:
+                candidates.extend((match.start(), rotation) for match in pattern.finditer(index.runs[rotation], max(start, 0)))
+        return candidates
+
+
+    def _count_candidates(self, index: PlacementIndex, size: int, after = -1) -> int:
+        rotations = (0,) if size == 1 else (0, 1)
+        table = _FITS_TABLES[size]
+        cells = len(index.free)
+
+        amount = 0
+        for rotation in rotations:
+            start = after + 1 - rotation * cells
+            if start < cells:
+                amount += index.runs[rotation][max(start, 0):].translate(table).count(1)
+        return amount
+
+
+    def _most_constrained(self, index: PlacementIndex, counts: dict[int, int], last: dict[int, int]) -> Optional[tuple[int, list]]:
+        """
+        Picks size which has the least legal placements left and returns (size, placements to try).
+        Returns None when some size has less placements left than entities of this size - it's a dead end.
+        last holds key of the latest placement of every size, it's -1 unless search is ordered.
+        """
+        best_size, best_amount = 0, -1
+        for size, amount in counts.items():
+            if amount == 0:
+                continue
+
+            candidates_amount = self._count_candidates(index, size, last[size])
+            if candidates_amount < amount:
+                return None
+
+            if best_amount == -1 or candidates_amount < best_amount or (candidates_amount == best_amount and size > best_size):
+                best_size, best_amount = size, candidates_amount
+
+        candidates = self._candidates(index, best_size, last[best_size])
+        if not self.ordered:
+            self.rng.shuffle(candidates)
+        return (best_size, candidates)
+
+
+    def _occupied_indexes(self, size: int, anchor_index: int, rotation: int) -> list[int]:
+        dy, dx = DIRECTIONS[rotation]
+        step = dy * self.width + dx
+        return [anchor_index + i*step for i in range(size)]
+
+
+    def _place_ships(self, base: PlacementIndex) -> Optional[list[tuple[EntityType, tuple[int, int], int]]]:
+        """
+        Depth-first search of placements for all ships and relays. Returns None if backtracks limit reached.
+        """
+        counts: dict[int, int] = {}
+        for etype, amount in self.pending.items():
+            if etype in ENTITY_SIZES:
+                size = ENTITY_SIZES[etype]
+                counts[size] = counts.get(size, 0) + amount
+        left = sum(counts.values())
+        last = {size: -1 for size in counts} # key of the latest placement of every size for ordered search
+        cells = len(base.free)
+
+        placements: list[tuple[int, int, int]] = [] # (size, flat anchor index, rotation)
+        stack: list[list] = [] # frames of decisions: [index before decision, size, placements to try, next try position, last key before decision]
+        index = base
+        backtracks_limit = None if self.max_backtracks is None else self.backtracks + self.max_backtracks
+        self.exhausted = False
+
+        while left:
+            if self._deadline is not None and self.steps % 64 == 0 and monotonic() > self._deadline:
+                self.timed_out = True
+                return None
+            
+            choice = self._most_constrained(index, counts, last)
+            if choice is not None:
+                size, candidates = choice
+                stack.append([index, size, candidates, 0, last[size]])
+
+            # takes next untried placement of the deepest decision, undoing it's previous try
+            while True:
+                if not stack:
+                    self.exhausted = True
+                    return None
+
+                frame = stack[-1]
+                parent, size, candidates, position, previous_key = frame
+                if position > 0:
+                    placements.pop()
+                    counts[size] += 1
+                    left += 1
+                    self.backtracks += 1
+                    if backtracks_limit is not None and self.backtracks > backtracks_limit:
+                        return None
+
+                if position == len(candidates):
+                    last[size] = previous_key
+                    stack.pop()
+                    continue
+
+                anchor_index, rotation = candidates[position]
+                frame[3] = position + 1
+                break
+
+            index = parent.copy()
+            index.occupy(self._occupied_indexes(size, anchor_index, rotation))
+            placements.append((size, anchor_index, rotation))
+            counts[size] -= 1
+            left -= 1
+            self.steps += 1
+            if self.ordered:
+                last[size] = rotation * cells + anchor_index
+
+        return self._label(placements)
+
+
+    def _label(self, placements: list[tuple[int, int, int]]) -> list[tuple[EntityType, tuple[int, int], int]]:
+        """
+        Gives entity types to solved placements and converts them to (entity type, (y, x), rotation).
+        Entities of the same size are interchangeable so types are given in any order.
+        Rotation is randomized between equivalent ones so ships don't all look right and down.
+        """
+        types_by_size: dict[int, list[EntityType]] = {}
+        for etype, amount in self.pending.items():
+            if etype in ENTITY_SIZES:
+                types_by_size.setdefault(ENTITY_SIZES[etype], []).extend([etype] * amount)
+
+        layout = []
+        for size, anchor_index, rotation in sorted(placements, reverse=True):
+            anchor = divmod(anchor_index, self.width)
+
+            if size == 1:
+                rotation = self.rng.randint(0, 3)
+            elif self.rng.random() < 0.5: # same cells from the other end
+                dy, dx = DIRECTIONS[rotation]
+                anchor = (anchor[0] + (size - 1)*dy, anchor[1] + (size - 1)*dx)
+                rotation += 2
+
+            layout.append((types_by_size[size].pop(), anchor, rotation))
+        return layout
+
+
+def _solve_with_seed(solver: LayoutSolver, seed: int) -> tuple[Optional[list], int, int, int]:
+    """
+    Process pool task. Gets pickled solver copy, reseeds and runs it.
+    Returns (layout or None, steps, backtracks, restarts).
+    """
+    solver.rng = random.Random(seed)
+    solver.steps, solver.backtracks, solver.restarts = 0, 0, 0
+
+    layout = solver.solve()
+    return (layout, solver.steps, solver.backtracks, solver.restarts)
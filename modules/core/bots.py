@@ -150,4 +150,7 @@ class Hunter(Bot):
 
 
     def __str__(self):
-        return f"HunterBot-{self.name}"
\ No newline at end of file
+        return f"HunterBot-{self.name}"
+
+
+BOTS = {"randomer": Randomer, "hunter": Hunter} # {name used by CLI and simulations: bot class}
@@ -1,17 +1,21 @@
 import logging
 from random import choice, randint
-from typing import Optional
+from typing import Callable, Optional
 
 from modules.common.enums import EntityType, EntityStatus
 from modules.common.exceptions import EntityException
-from modules.common.utils import circle_coords, sort_circle_coords, invert_output
+from modules.common.utils import orbit_offsets, invert_output
 
 
 logger = logging.getLogger(__name__)
 
+_NO_SEGMENTS: dict = {} # shared by all entities which occupy nothing yet, never changed
+
 
 class Entity:
 
+    __slots__ = ("eid", "anchor", "size", "rotation", "_cells_occupied", "_segments", "_damage", "type", "_status", "on_destroyed")
+
     _counter = 0 # used to implement entity ids
     def __init__(self):
 
@@ -26,12 +30,23 @@ class Entity:
         
         # reference attributes
         self.cells_occupied = [] # list of cell coords
-        self.cells_damaged = set() # cells which have damage where 0 is anchor
+        self._damage = 0 # bitmask of damaged cells where bit 0 is anchor
 
         # state and identification
         self.type = EntityType.UNIDENTIFIED
         self._status = EntityStatus.NOTPLACED
 
+        # called once entity is destroyed by damage, owner keeps it's alive counters with it
+        self.on_destroyed: Optional[Callable[["Entity"], None]] = None
+
+
+    @staticmethod
+    def reserve_id(eid: int) -> None:
+        """
+        Marks id as taken, so entities created later don't reuse it.
+        Used when entity gets id which wasn't given by the counter - e.g. restored from recorded game.
+        """
+        Entity._counter = max(Entity._counter, eid + 1)
 
 
     def update_state(
@@ -52,19 +67,67 @@ class Entity:
         if status is not None: self.status = status
 
 
+    def fork(self) -> "Entity":
+        """
+        Returns copy of entity for forked game.
+        Geometry (occupied cells, segments, orbit) is shared - it's only replaced on placement, never changed in place.
+        Hook is not copied, new owner binds it's own.
+        """
+        clone = object.__new__(type(self)) # attributes are set directly - it's several times faster than copy.copy()
+        clone.eid = self.eid
+        clone.anchor = self.anchor
+        clone.size = self.size
+        clone.rotation = self.rotation
+        clone._cells_occupied = self._cells_occupied
+        clone._segments = self._segments
+        clone._damage = self._damage
+        clone.type = self.type
+        clone._status = self._status
+        clone.on_destroyed = None
+        return clone
+
+
+    @property
+    def cells_occupied(self) -> list[tuple[int, int]]:
+        return self._cells_occupied
+
+    @cells_occupied.setter
+    def cells_occupied(self, value: list[tuple[int, int]]):
+        """
+        Also maps every occupied coords to it's segment number (distance from anchor) for make_damage().
+        """
+        self._cells_occupied = value
+        self._segments = {coords: segment for segment, coords in enumerate(value)} if value else _NO_SEGMENTS
+
+
+    @property
+    def cells_damaged(self) -> set[int]:
+        """
+        Segments which have damage where 0 is anchor.
+        """
+        return {segment for segment in range(len(self._cells_occupied)) if self._damage >> segment & 1}
+
+
     def make_damage(self, coords: tuple[int, int]) -> None:
         "Converts given coords to distance from anchor point and marks it as damaged."
-        if coords not in self.cells_occupied:
+        segment = self._segments.get(coords)
+        if segment is None:
             raise EntityException(f"Tried to damage {coords} which are not cells occupied by {self}")
         
-        damaged_tile = self.cells_occupied.index(coords)
+        self._damage |= 1 << segment
         
-        self.cells_damaged.add(damaged_tile)
-
-        if self.size == len(self.cells_damaged):
-            self.status = EntityStatus.DESTROYED
+        # status is set directly - it's always valid here, and setter checks are not needed on every hit
+        old = self._status
+        if self._damage == (1 << self.size) - 1:
+            self._status = EntityStatus.DESTROYED
         else:
-            self.status = EntityStatus.DAMAGED
+            self._status = EntityStatus.DAMAGED
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{self} state changed: {old} → {self._status}")
+
+        if self._status == EntityStatus.DESTROYED and old != EntityStatus.DESTROYED and self.on_destroyed is not None:
+            self.on_destroyed(self)
 
 
     @property
@@ -79,7 +142,8 @@ class Entity:
         old = self._status
         self._status = value
         
-        logger.debug(f"{self} state changed: {old} → {self.status}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{self} state changed: {old} → {self.status}")
 
 
     @staticmethod
@@ -124,6 +188,8 @@ class Ship(Entity):
     Can be placed next to the field border and planet orbits.
     Can't be placed next to other ships or relays.
     """
+    __slots__ = ()
+
     def __init__(self, etype: EntityType):
         """
         Creates ship entity with given ship type.
@@ -163,7 +229,12 @@ class Planet(Entity):
     Can cross field partially - that's why position of planet (it's anchor) stored in entity instance and not in field's.
     Field only knows which cells are belong to planet's orbit.
     """
-    def __init__(self, radius: int, center: tuple, rotation: Optional[int] = None):
+    __slots__ = ("orbit_radius", "orbit_center", "orbit_cells", "_position")
+
+    def __init__(self, radius: int, center: tuple, rotation: Optional[int] = None, position: Optional[int] = None):
+        """
+        Rotation and starting position on orbit are random unless given.
+        """
         super().__init__()
         
         self.orbit_radius = radius
@@ -179,8 +250,18 @@ class Planet(Entity):
         # sign of rotation defines direction and value defines speed
         else: self.rotation = rotation
 
-        self.set_orbit(radius, center)
-        self.position = 0 # is used for iterating in orbit_cells lists
+        self.set_orbit(radius, center, position)
+        if position is None:
+            self.position = 0 # is used for iterating in orbit_cells lists
+
+
+    def fork(self) -> "Planet":
+        clone: Planet = super().fork() # type: ignore
+        clone.orbit_radius = self.orbit_radius
+        clone.orbit_center = self.orbit_center
+        clone.orbit_cells = self.orbit_cells
+        clone._position = self._position
+        return clone
 
 
     @property
@@ -209,6 +290,26 @@ class Planet(Entity):
         self.anchor = self.orbit_cells[self._position]
 
     
+    def position_at(self, turns: int) -> int:
+        """
+        Returns orbit position planet will have after given amount of turns (moves by 1) from now.
+        Doesn't account collisions - see Player.planet_schedule() for that.
+        """
+        length = len(self.orbit_cells)
+        if length == 0:
+            return self.position
+        return (self.position + turns * self.rotation) % length
+
+
+    def anchor_at(self, turns: int) -> tuple:
+        """
+        Returns coords of planet after given amount of turns from now. Destroyed planet has no anchor.
+        """
+        if self.status == EntityStatus.DESTROYED:
+            return ()
+        return self.orbit_cells[self.position_at(turns)]
+
+
     @property
     def status(self):
         return self._status
@@ -227,22 +328,26 @@ class Planet(Entity):
             self._status = value
 
 
-    def set_orbit(self, radius: int, center: tuple[int, int]) -> None:
+    def set_orbit(self, radius: int, center: tuple[int, int], position: Optional[int] = None) -> None:
         """
         Generates orbit cells and saves them in the planet instance.
+        Orbit shape is cached by radius already sorted by angle, so it's only moved to the center.
+        Planet is put on given orbit position or on random one.
         """
         if radius == 0:
-            self.orbit_center = center
-            self.orbit_cells = [center]
-            return
-        
-        orbit = circle_coords(radius, center)
-        orbit = sort_circle_coords(center, orbit)
+            orbit = [center]
+        else:
+            y0, x0 = center
+            orbit = [(y0 + dy, x0 + dx) for dy, dx in orbit_offsets(radius)]
         
         self.orbit_center = center
         self.orbit_cells = orbit
 
-        self.position = randint(0, len(orbit) - 1)
+        if position is not None:
+            self._position = position % len(orbit)
+            self.anchor = orbit[self._position]
+        elif radius != 0:
+            self.position = randint(0, len(orbit) - 1)
 
 
     @property
@@ -275,6 +380,8 @@ class Relay(Entity):
     """
     1-tiled ships which returns shot on shooter's field.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.type = EntityType.RELAY
@@ -0,0 +1,131 @@
+import logging
+from array import array
+from dataclasses import dataclass
+
+from modules.core.autoplace import LayoutSolver
+from modules.core.placement import PlacementIndex, ENTITY_SIZES
+
+from modules.common.cache import LRUCache
+from modules.common.enums import EntityType, FeasibilityStatus
+
+
+logger = logging.getLogger(__name__)
+
+QUICK_PASS_BACKTRACKS = 32
+
+# {(height, width, void mask, fleet, exact pass time limit): Feasibility}
+feasibility_cache = LRUCache(maxsize=256)
+
+
+@dataclass(frozen=True)
+class Feasibility:
+    status: FeasibilityStatus
+    reason: str
+
+
+def check_fleet(field, pending: dict[EntityType, int], *, exact_time_limit = 0.5) -> Feasibility:
+    """
+    Checks if entities can be placed on blank field of the same geometry as given field.
+    1. Bounds pass: ships with their halo need more room or more 2x2 blocks than field has - doesn't fit.
+    2. Quick pass: short search finds layout - fits.
+    3. Exact pass: exhaustive search bounded by exact_time_limit seconds. Runs out of time - unknown.
+    Planets are placed first and their orbits take cells from ships. Orbit may cross field in a single cell
+    and orbits may overlap each other, so bounds only require one real cell for all planets. Quick pass places planets the same way autoplace does,
+    exact pass searches ships only, so with planets it can't prove that fleet fits.
+    Results are memoized by (field mask, fleet composition, exact_time_limit).
+    """
+    height, width = field.dimensions["height"], field.dimensions["width"]
+    fleet = tuple(sorted((etype.value, amount) for etype, amount in pending.items() if amount > 0))
+    key = (height, width, field.void_mask, fleet, exact_time_limit)
+
+    result = feasibility_cache.get(key)
+    if result is None:
+        result = _check(height, width, field.void_mask, pending, exact_time_limit)
+        feasibility_cache.put(key, result)
+    return result
+
+
+def _check(height: int, width: int, void: bytes, pending: dict[EntityType, int], exact_time_limit: float) -> Feasibility:
+    useful_cells = len(void) - void.count(1)
+    ships = {etype: amount for etype, amount in pending.items() if etype in ENTITY_SIZES and amount > 0}
+    planets = pending.get(EntityType.PLANET, 0)
+
+    if planets and not useful_cells:
+        return Feasibility(FeasibilityStatus.DOESNT_FIT, "no real cells for planet orbits to cross")
+    if not ships:
+        return Feasibility(FeasibilityStatus.FITS, "no ships or relays to place")
+
+    # every ship of size s together with cells right and down of it forms 2*(s+1) box
+    # boxes of ships which don't touch never overlap, so all boxes must fit in field expanded by one cell right and down
+    ships_cells = sum(ENTITY_SIZES[etype] * amount for etype, amount in ships.items())
+    ships_boxes = sum(2 * (ENTITY_SIZES[etype] + 1) * amount for etype, amount in ships.items())
+
+    free_cells = useful_cells - 1 if planets else useful_cells
+    if ships_cells > free_cells:
+        return Feasibility(FeasibilityStatus.DOESNT_FIT, f"ships and relays need {ships_cells} cells, field has {free_cells} free")
+
+    expanded_area = _expanded_area(height, width, void)
+    if ships_boxes > expanded_area:
+        return Feasibility(FeasibilityStatus.DOESNT_FIT, f"ships and relays need at least {ships_boxes} cells with their borders, field gives {expanded_area}")
+
+    # any two cells of aligned 2x2 block touch each other, so every block holds cells of one ship at most
+    # and ship of size s spans at least ceil(s/2) blocks
+    ships_blocks = sum((ENTITY_SIZES[etype] + 1) // 2 * amount for etype, amount in ships.items())
+    blocks = _blocks_amount(height, width, void)
+    if ships_blocks > blocks:
+        return Feasibility(FeasibilityStatus.DOESNT_FIT, f"ships and relays need at least {ships_blocks} separate 2x2 blocks, field has {blocks}")
+
+    index = PlacementIndex(height, width, void, array("i", [-1]) * len(void), {})
+
+    quick = LayoutSolver(height, width, void, index, pending, seed=0, max_backtracks=QUICK_PASS_BACKTRACKS, max_restarts=1)
+    if quick.solve() is not None:
+        return Feasibility(FeasibilityStatus.FITS, f"layout found in {quick.steps} steps")
+
+    if not exact_time_limit:
+        return Feasibility(FeasibilityStatus.UNKNOWN, "quick search found no layout, exact search is disabled")
+
+    exact = LayoutSolver(height, width, void, index, ships, seed=0, max_backtracks=None, max_restarts=1, time_limit=exact_time_limit, ordered=True)
+    if exact.solve() is not None:
+        if planets:
+            return Feasibility(FeasibilityStatus.UNKNOWN, f"ships and relays fit on blank field in {exact.steps} steps, but no layout found with planet orbits")
+        return Feasibility(FeasibilityStatus.FITS, f"layout found in {exact.steps} steps")
+    if exact.exhausted:
+        return Feasibility(FeasibilityStatus.DOESNT_FIT, f"no layout exists, all {exact.steps} placements tried")
+
+    logger.info(f"Exact feasibility search for {pending} ran out of {exact_time_limit}s")
+    return Feasibility(FeasibilityStatus.UNKNOWN, f"no layout found in {exact_time_limit}s")
+
+
+def _expanded_area(height: int, width: int, void: bytes) -> int:
+    """
+    Counts cells of (height+1) x (width+1) grid covered by field cells shifted by (0,0), (0,1), (1,0) and (1,1).
+    """
+    expanded_width = width + 1
+    covered = bytearray((height + 1) * expanded_width)
+
+    for index, is_void in enumerate(void):
+        if is_void:
+            continue
+        y, x = divmod(index, width)
+        corner = y * expanded_width + x
+        covered[corner] = covered[corner + 1] = 1
+        covered[corner + expanded_width] = covered[corner + expanded_width + 1] = 1
+
+    return covered.count(1)
+
+
+def _blocks_amount(height: int, width: int, void: bytes) -> int:
+    """
+    Splits field into 2x2 blocks and counts blocks with at least one real cell.
+    Every of 4 possible grid alignments gives valid bound, so the smallest count is returned.
+    """
+    amounts = []
+    for offset_y in (0, 1):
+        for offset_x in (0, 1):
+            blocks = set()
+            for index, is_void in enumerate(void):
+                if not is_void:
+                    y, x = divmod(index, width)
+                    blocks.add(((y + offset_y) // 2, (x + offset_x) // 2))
+            amounts.append(len(blocks))
+    return min(amounts)
@@ -1,29 +1,77 @@
 import logging
+from array import array
 from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Optional
 
-from modules.common.enums import CellStatus, EntityType, EntityStatus
+from modules.common.cache import LRUCache
+from modules.common.enums import CellStatus, EntityType, EntityStatus, PlacementStatus
 from modules.common.exceptions import FieldException
-from modules.common.utils import circle_coords, ngon_coords, invert_output
+from modules.common.utils import circle_coords, clip_orbit, ngon_coords, invert_output, scanline_bounds
+from modules.common.zobrist import zobrist_key
+from modules.core.placement import PlacementIndex, ENTITY_SIZES, DIRECTIONS
 
 
 logger = logging.getLogger(__name__)
 
+NO_OCCUPANT = -1 # value of occupants array for cells which don't belong to any entity
+NGON_VERTICES = {"triangle": 3, "rhombus": 4, "pentagon": 5, "hexagon": 6, "heptagon": 7}
+
+
+@dataclass(frozen=True)
+class FieldMask:
+    """
+    Immutable geometry of generated field. Shared between all fields of the same shape and parameters.
+    """
+    shape: str
+    height: int
+    width: int
+    void: bytes # 1 - structural void cell, indexed by y*width + x
+    useful_cells_coords: tuple[tuple[int, int], ...]
+
+
+# process-wide cache of generated geometry: {(shape, *params): FieldMask}
+# use mask_cache.resize() to change its bound; 0 disables caching
+mask_cache = LRUCache(maxsize=64)
+
 
 class Cell:
     """
     Smallest field unit.
     Void - are structural cells.
     Every cell has link to entity it belongs to. Entity itself decides which of cell is what part.
+    Cell doesn't store anything itself - it's a view on (y, x) position of field's flat arrays.
     """
-    def __init__(self, y: int, x: int, *, is_void = False):
+    __slots__ = ("field", "y", "x", "index")
+
+    def __init__(self, field: "Field", y: int, x: int):
 
         if not(isinstance(y, int) and isinstance(x, int)):
             raise TypeError("Cell coordinates must be integers")
         
+        self.field = field
         self.y, self.x = y, x
-        self.is_void = is_void
-        self.was_shot = False
-        self.occupied_by = None
+        self.index = y * field.dimensions["width"] + x
+
+    @property
+    def is_void(self) -> bool:
+        return bool(self.field._void[self.index])
+
+    @property
+    def was_shot(self) -> bool:
+        return bool(self.field._shot[self.index])
+
+    @was_shot.setter
+    def was_shot(self, value: bool) -> None:
+        self.field._shot[self.index] = 1 if value else 0
+
+    @property
+    def occupied_by(self):
+        return self.field._entities.get(self.field._occupants[self.index])
+
+    @occupied_by.setter
+    def occupied_by(self, entity) -> None:
+        self.field._set_occupant(self.index, entity)
 
     def free(self) -> None:
         self.occupied_by = None
@@ -45,7 +93,15 @@ class Field:
         
         self.name = str(name)
 
-        self._cells: dict[tuple[int, int], Cell] = {}
+        # cells state is kept in flat arrays indexed by y*width + x
+        self._void = bytearray() # 1 - structural void cell
+        self._shot = bytearray() # 1 - cell was shot
+        self._occupants = array("i") # eid of entity which occupies cell or NO_OCCUPANT
+        self._entities: dict[int, object] = {} # {eid: Entity} of all entities ever placed on field
+        self._mask: FieldMask | None = None # cached geometry field was stamped from
+        self._useful_cells: tuple[tuple[int, int], ...] | None = None # non-void coords, built once per geometry
+        self._placement: PlacementIndex | None = None # built on first demand
+        self.zobrist = 0 # XOR of zobrist keys of shot cells with their results
         self.dimensions = {"height": 0, "width": 0}
         self.shape = None
         
@@ -54,32 +110,136 @@ class Field:
 
 
     @property
-    def useful_cells_coords(self) -> list[tuple[int, int]]:
+    def useful_cells_coords(self) -> tuple[tuple[int, int], ...]:
+        """
+        Returns all non-void cells coords.
+        Tuple is immutable and shared between calls (and with fields of the same cached mask),
+        it's dropped only when field geometry changes.
+        """
+        if self._useful_cells is None:
+            if self._mask is not None:
+                self._useful_cells = self._mask.useful_cells_coords
+            else:
+                width = self.dimensions["width"]
+                self._useful_cells = tuple(divmod(index, width) for index, is_void in enumerate(self._void) if not is_void)
+        return self._useful_cells
+
+
+    @property
+    def void_mask(self) -> bytes:
         """
-        Returns list of all non-void cells.
+        Flat void flags of all cells indexed by y*width + x.
         """
-        return [coords for coords, cell in self._cells.items() if not cell.is_void]
+        return bytes(self._void)
+
+
+    @property
+    def placement(self) -> PlacementIndex:
+        """
+        Index of legal ship and relay anchors. Built on first access and then updated on every placement.
+        """
+        if self._placement is None:
+            self._placement = PlacementIndex(
+                self.dimensions["height"], self.dimensions["width"], self._void, self._occupants, self._entities
+            )
+        return self._placement
+
+
+    def legal_placements(self, etype: EntityType) -> list[tuple[tuple[int, int], int]]:
+        """
+        Returns all ((y, x), rotation) where ship or relay of given type can be placed right now.
+        """
+        if etype not in ENTITY_SIZES:
+            raise FieldException(f"{self}: legal placements are indexed for ships and relays only, not {etype}")
+        return self.placement.legal_placements(ENTITY_SIZES[etype])
+
+
+    def fork(self, entities: dict) -> "Field":
+        """
+        Returns independent copy of field where occupants are taken from given {eid: Entity} of forked owner.
+        Void mask stamped from cache is immutable and shared, so is useful cells tuple. Cell states arrays are copied.
+        """
+        clone = Field.__new__(Field)
+        clone.name = self.name
+        clone.shape = self.shape
+        clone.dimensions = dict(self.dimensions)
+
+        clone._void = self._void if isinstance(self._void, bytes) else self._void[:]
+        clone._shot = self._shot[:]
+        clone.zobrist = self.zobrist
+        clone._occupants = self._occupants[:]
+        clone._entities = {eid: entities.get(eid, entity) for eid, entity in self._entities.items()}
+        clone._mask = self._mask
+        clone._useful_cells = self._useful_cells
+        clone._placement = self._placement.copy() if self._placement is not None else None
+        return clone
 
 
     def is_empty(self) -> bool:
-        return not self._cells
+        return not self._void
 
 
     def wipe_field(self) -> None:
-        self._cells = {}
+        self._allocate(0, 0)
         self.shape = None
-        self.dimensions = {"height": 0, "width": 0}
         
         logger.info(f"{self} wiped")
 
 
+    def _allocate(self, height: int, width: int, void: bytes = None) -> None: # type: ignore
+        """
+        Creates blank storage for height x width field where no cell is shot or occupied.
+        If no void mask given - no cell is void either.
+        """
+        self.dimensions = {"height": height, "width": width}
+        size = max(height, 0) * max(width, 0)
+
+        self._void = bytearray(size) if void is None else void
+        self._mask = None
+        self._useful_cells = None
+        self._placement = None
+        self._shot = bytearray(size)
+        self.zobrist = 0
+        self._occupants = array("i", [NO_OCCUPANT]) * size
+        self._entities = {}
+
+
+    def _index(self, coords: tuple[int, int]) -> int:
+        """
+        Converts (y, x) into flat arrays index. Returns -1 if coords are out of field bounds.
+        """
+        y, x = coords
+        height, width = self.dimensions["height"], self.dimensions["width"]
+        if 0 <= y < height and 0 <= x < width:
+            return y * width + x
+        return -1
+
+
+    def _set_occupant(self, index: int, entity) -> None:
+        if entity is None:
+            self._occupants[index] = NO_OCCUPANT
+            return
+        self._entities[entity.eid] = entity
+        self._occupants[index] = entity.eid
+
+
+    def _occupant(self, index: int):
+        """
+        Returns entity which occupies cell with given flat index or None.
+        """
+        eid = self._occupants[index]
+        if eid == NO_OCCUPANT:
+            return None
+        return self._entities[eid]
+
+
     def cell_exists(self, coords: tuple[int, int]) -> bool:
         """
         Checks if cell with given (y, x) is part of field
         """
         if coords is None:
             return False
-        return coords in self._cells
+        return self._index(coords) != -1
     
 
     def generate_field(self, shape: str|int, params: list[str|int]) -> None:
@@ -97,14 +257,12 @@ class Field:
             case "rectangle"|"1":
                 if len(params) < 2: raise FieldException(f"{self}: No proper rectangle dimensions given")
                 height, width = int(params[0]), int(params[1])
-                self.generate_rectangle(height, width)
-                self.shape = "rectangle"
+                mask_key = ("rectangle", height, width)
             
             case "circle"|"2":
                 if len(params) < 1: raise FieldException(f"{self}: No proper circle radius given")
                 radius = int(params[0])
-                self.generate_circle(radius)
-                self.shape = "circle"
+                mask_key = ("circle", radius)
             
             case "triangle"|"3":
                 if len(params) < 1: raise FieldException(f"{self}: No proper triangle size given")
@@ -113,8 +271,7 @@ class Field:
                     angle = float(params[1])
                 except IndexError:
                     angle = 0
-                self.generate_ngon(3, radius, angle)
-                self.shape = "triangle"
+                mask_key = ("triangle", radius, angle)
             
             case "rhombus"|"4":
                 if len(params) < 1: raise FieldException(f"{self}: No proper rhombus size given")
@@ -123,8 +280,7 @@ class Field:
                     angle = float(params[1])
                 except IndexError:
                     angle = 0
-                self.generate_ngon(4, radius, angle)
-                self.shape = "rhombus"
+                mask_key = ("rhombus", radius, angle)
             
             case "pentagon"|"5":
                 if len(params) < 1: raise FieldException(f"{self}: No proper pentagon size given")
@@ -133,8 +289,7 @@ class Field:
                     angle = float(params[1])
                 except IndexError:
                     angle = 0
-                self.generate_ngon(5, radius, angle)
-                self.shape = "pentagon"
+                mask_key = ("pentagon", radius, angle)
             
             case "hexagon"|"6":
                 if len(params) < 1: raise FieldException(f"{self}: No proper hexagon size given")
@@ -143,8 +298,7 @@ class Field:
                     angle = float(params[1])
                 except IndexError:
                     angle = 0
-                self.generate_ngon(6, radius, angle)   
-                self.shape = "hexagon"     
+                mask_key = ("hexagon", radius, angle)
 
             case "heptagon"|"7":
                 if len(params) < 1: raise FieldException(f"{self}: No proper heptagon size given")
@@ -153,51 +307,82 @@ class Field:
                     angle = float(params[1])
                 except IndexError:
                     angle = 0
-                self.generate_ngon(7, radius, angle)
-                self.shape = "heptagon"
+                mask_key = ("heptagon", radius, angle)
 
             case _:
                 raise FieldException(f"{self}: no {shape} shape supported")
-            
+        
+        mask = mask_cache.get(mask_key)
+        if mask is None:
+            mask = self._generate_mask(mask_key)
+            mask_cache.put(mask_key, mask)
+        
+        self.stamp_mask(mask)
         logger.info(f"{self} generated")
 
 
-    def voidify_corners(self, coords: list[tuple[int, int]]) -> None:
+    def _generate_mask(self, mask_key: tuple) -> "FieldMask":
+        """
+        Builds geometry described by (shape, *params) key from scratch and freezes it into FieldMask.
+        """
+        shape, *params = mask_key
+        
+        if shape == "rectangle":
+            self.generate_rectangle(*params)
+        elif shape == "circle":
+            self.generate_circle(*params)
+        else:
+            self.generate_ngon(NGON_VERTICES[shape], *params)
+        
+        width = self.dimensions["width"]
+        return FieldMask(
+            shape=shape,
+            height=self.dimensions["height"],
+            width=width,
+            void=bytes(self._void),
+            useful_cells_coords=self.useful_cells_coords,
+        )
+
+
+    def stamp_mask(self, mask: "FieldMask") -> None:
+        """
+        Makes field a blank copy of given mask geometry.
+        Void mask is never changed after generation, so it's shared with the mask and not copied.
+        """
+        self._allocate(mask.height, mask.width, void=mask.void)
+        self.shape = mask.shape
+        self._mask = mask
+
+
+    def voidify_corners(self, coords: Iterable[tuple[int, int]]) -> None:
         """
         Expects list of edges coords.
         Makes void all cells which must be vodified to form a field shape.
         It "cuts" given shape from rectangle.
-        It's continiously coming from both field x-axis edges and making void every tile until shape edge in coords met.
+        Every row is made void from both field x-axis edges until shape edge in coords met.
+        Edges of each row are found once by scanline pass, so spans are voided in bulk.
         """
-        voided = set()
+        height, width = self.dimensions["height"], self.dimensions["width"]
+        void_row = b"\x01" * width
+        self._useful_cells = None
         
-        for y in range(self.dimensions["height"]):
-
-            for x in range(self.dimensions["width"]): # step from left side
-                if (y, x) not in coords:
-                    voided.add((y, x))
-                else:
-                    break
+        for y, row_bounds in enumerate(scanline_bounds(coords, height, width)):
+            row_start = y * width
             
-            for x in range(self.dimensions["width"]-1, -1, -1): # step from right side
-                if (y, x) not in coords:
-                    voided.add((y, x))
-                else:
-                    break
-        
-        for yx in voided:
-            self.get_cell(yx).is_void = True
+            if row_bounds is None: # shape border never crosses this row
+                self._void[row_start:row_start + width] = void_row
+                continue
+            
+            left, right = row_bounds
+            self._void[row_start:row_start + left] = void_row[:left]
+            self._void[row_start + right + 1:row_start + width] = void_row[right + 1:]
 
 
     def generate_rectangle(self, height: int, width: int) -> None:
         """
         Generates rectangle field with given height and width.
         """
-        self.dimensions = {"height": height, "width": width}
-
-        for y in range(height):
-            for x in range(width):
-                self._cells[(y, x)] = Cell(y, x)
+        self._allocate(height, width)
 
 
     def generate_circle(self, radius: int) -> None:
@@ -206,10 +391,7 @@ class Field:
         """
         size = 2*radius + 1
 
-        self.dimensions ={"height": size, "width": size}
-        for y in range(size):
-            for x in range(size):
-                self._cells[(y, x)] = Cell(y, x)
+        self._allocate(size, size)
         
         circle_borders = circle_coords(radius, (radius, radius))
         self.voidify_corners(circle_borders)
@@ -232,10 +414,7 @@ class Field:
         for y, x in ngon_border:
             normalized_coords.append((y-y_min, x-x_min))
         
-        self.dimensions ={"height": y_max, "width": x_max}
-        for y in range(y_max):
-            for x in range(x_max):
-                self._cells[(y, x)] = Cell(y, x)
+        self._allocate(y_max, x_max)
         self.voidify_corners(normalized_coords)
 
 
@@ -249,13 +428,97 @@ class Field:
         
         if not coords or coords is None: raise FieldException(f"{self}: Asked for no cells.")
         
-        try:
-            return self._cells[coords]
-        
-        except KeyError:
+        if self._index(coords) == -1:
             raise FieldException(f"{self}: Requested {invert_output(coords)}(coords) does not exist.")
+        
+        return Cell(self, *coords)
     
 
+    def clip_orbit(self, center: tuple[int, int], radius: int) -> tuple[list[tuple[int, int]], int]:
+        """
+        Returns (orbit cells coords which are part of the field, amount of them which are not void)
+        for orbit with given center and radius. Orbit may lie out of bounds partially or fully.
+        """
+        height, width = self.dimensions["height"], self.dimensions["width"]
+        indexes, real_cells = clip_orbit(center, radius, height, width, self._void)
+        return ([divmod(index, width) for index in indexes], real_cells)
+
+
+    def can_place(self, etype: EntityType, anchor_coords: tuple[int, int], rotation: int) -> PlacementStatus:
+        """
+        Non-raising placement probe. Nothing is changed on the field.
+        For ships and relays rotation is direction, for planets - orbit radius (same as r in Game.place_entity).
+        Returns PlacementStatus.OK or the reason why entity can't be placed.
+        """
+        if not self._void:
+            return PlacementStatus.NO_FIELD
+        
+        if etype == EntityType.PLANET:
+            _, real_cells = self.clip_orbit(anchor_coords, rotation)
+            return PlacementStatus.OK if real_cells else PlacementStatus.NO_CROSSING
+        
+        size = ENTITY_SIZES.get(etype)
+        if size is None:
+            return PlacementStatus.UNSUPPORTED
+        
+        if self.placement.is_legal(size, anchor_coords, rotation):
+            return PlacementStatus.OK
+        
+        # placement is illegal - walks entity cells to find out why
+        height, width = self.dimensions["height"], self.dimensions["width"]
+        dy, dx = DIRECTIONS[rotation % 4]
+        y, x = anchor_coords
+        for i in range(size):
+            cy, cx = y + i*dy, x + i*dx
+            if not (0 <= cy < height and 0 <= cx < width):
+                return PlacementStatus.OUT_OF_BOUNDS
+            
+            index = cy*width + cx
+            if self._void[index]:
+                return PlacementStatus.VOID
+            if self._occupants[index] != NO_OCCUPANT:
+                return PlacementStatus.OCCUPIED
+        
+        return PlacementStatus.TOO_CLOSE
+
+
+    def placement_error(self, etype: EntityType, anchor_coords: tuple[int, int], rotation: int) -> FieldException:
+        """
+        Explains illegal placement: returns exception with the message placing entity would raise.
+        Arguments are the same as for can_place(). Cells are walked one by one, so it's only for placements already known to be illegal.
+        """
+        if etype == EntityType.PLANET:
+            if self.is_empty():
+                return FieldException(f"{self}: Tried to setup a planet with no field.")
+            return FieldException(f"{self}: orbit of planet never crosses any field cell. Change center or radius")
+
+        if self.is_empty():
+            return FieldException(f"{self}: Tried to get cell with no field.")
+
+        dy, dx = DIRECTIONS[rotation % 4]
+        y, x = anchor_coords
+        reserved_coords = [(y + i*dy, x + i*dx) for i in range(ENTITY_SIZES[etype])]
+
+        # checks if someone is in the closest cells
+        for coords in self.neighbours(reserved_coords):
+            occupier = self._occupant(self._index(coords))
+            if occupier is not None and occupier.type != EntityType.PLANET:
+                return FieldException(f"{self}: {self.get_cell(coords)} too close to {occupier}")
+
+        # checks available coords conditions which entity is placed on
+        for coords in reserved_coords:
+            index = self._index(coords)
+            if index == -1:
+                return FieldException(f"{self}: Requested {invert_output(coords)}(coords) does not exist.")
+            
+            if self._void[index]:
+                return FieldException(f"{self}: {self.get_cell(coords)} is void")
+            elif self._occupants[index] != NO_OCCUPANT:
+                return FieldException(f"{self}: {self.get_cell(coords)} is already occupied by {self._occupant(index)}")
+
+        return FieldException(f"{self}: {etype} can't be placed on {invert_output(anchor_coords)}")
+
+
     def occupy_cells(self, entity, anchor_coords: tuple[int, int], rotation: int) -> None:
         """
         Takes entity and tries to place it correspondingly given (y, x) and rotation values.
@@ -275,32 +538,22 @@ class Field:
         # asks which cells entity wants to take depending on it's properties
         # recieves list of (y,x) and correct rotation (e.g.  rot = 5  -->  rot = 1)
         reserved_coords, rotation = entity.reserve_coords(anchor_coords, rotation)
-        available_cells = []
 
-        # checks if someone is in the closest cells
-        close_cells = self.neighbours(reserved_coords)
-        if close_cells is not None:
-            for coords in close_cells:
-                cell = self.get_cell(coords)
-                if cell.occupied_by is not None and cell.occupied_by.type != EntityType.PLANET:
-                    raise FieldException(f"{self}: {cell} too close to {cell.occupied_by}")
-
-        # checks available coords conditions which entity is placed on
-        for coords in reserved_coords:
-            cell = self.get_cell(coords)
-            
-            if cell.is_void:
-                raise FieldException(f"{self}: {cell} is void")
-            elif cell.occupied_by is not None:
-                raise FieldException(f"{self}: {cell} is already occupied by {cell.occupied_by}")
-            
-            available_cells.append(cell)
+        # placement index answers in O(1), cell by cell checks only run to explain why placement is illegal
+        if not self.placement.is_legal(entity.size, anchor_coords, rotation):
+            raise self.placement_error(entity.type, anchor_coords, rotation)
         
-        for coords in entity.cells_occupied: # TODO на сколько эта проверка вообще нужна?
-            self.get_cell(coords).free()
+        if entity.cells_occupied: # TODO на сколько эта проверка вообще нужна?
+            for coords in entity.cells_occupied:
+                self.get_cell(coords).free()
+            self._placement = None # freed cells can't be tracked incrementally - index is rebuilt on demand
         
-        for cell in available_cells:
-            cell.occupied_by = entity
+        available_indexes = [self._index(coords) for coords in reserved_coords]
+        for index in available_indexes:
+            self._set_occupant(index, entity)
+        
+        if self._placement is not None:
+            self._placement.occupy(available_indexes)
         
         # entity has only right to update it's inner links for convenience
         entity.update_state(anchor_coords = anchor_coords, cells_occupied = reserved_coords, rotation = rotation, status = EntityStatus.FULLHEALTH)
@@ -320,7 +573,7 @@ class Field:
                                 (1,-1),  (1,0),  (1,1)]:
                     
                     coords = (y + dy, x + dx)
-                    if coords not in coord_list and coords in self._cells: neighbours.add(coords)
+                    if coords not in coord_list and self._index(coords) != -1: neighbours.add(coords)
             return neighbours
     
 
@@ -332,65 +585,86 @@ class Field:
         if planet.type != EntityType.PLANET:
             raise FieldException(f"Tried to setup not a planet {planet} which is {planet.type}. Use occupy cells instead")
         
-        orbit_cells = set()
-        real_cells_counter = 0
-        for coords in planet.orbit_cells:
-            try:
-                cell = self.get_cell(coords)
-            except FieldException:
-                continue # when tried to place orbit cell out of bounds - skip
-            
-            orbit_cells.add(coords)
-            if not cell.is_void:
-                real_cells_counter += 1
+        if self.is_empty():
+            raise FieldException(f"{self}: Tried to setup a planet with no field.")
+        
+        # orbit cells out of bounds are skipped
+        height, width = self.dimensions["height"], self.dimensions["width"]
+        orbit_indexes, real_cells_counter = clip_orbit(planet.orbit_center, planet.orbit_radius, height, width, self._void)
         
         if real_cells_counter == 0:
             raise FieldException(f"{self}: orbit of planet never crosses any field cell. Change center or radius")
         
-        for coords in orbit_cells:
-            self.get_cell(coords).occupied_by = planet
+        for index in orbit_indexes:
+            self._set_occupant(index, planet)
+        
+        if self._placement is not None:
+            self._placement.occupy(orbit_indexes, halo=False)
         
         # damaged so first hit doesn't change it state
         # planets can be destroyed only on collision with other planets
-        planet.update_state(cells_occupied=list(orbit_cells), status=EntityStatus.DAMAGED)
+        planet.update_state(cells_occupied=[divmod(index, width) for index in orbit_indexes], status=EntityStatus.DAMAGED)
 
     
-    def take_shot(self, coords: tuple[int, int]) -> CellStatus:
+    def take_shot(self, coords: tuple[int, int], undo: Optional[list] = None) -> CellStatus:
         """
-        Returns result of attempt.
+        Returns result of attempt. Shot cell with it's result is added to field's zobrist hash.
+        If undo list is given, appends (field, cell index, occupier, it's damage, it's status, hash) before the shot to it - see undo_shot().
         """
         cell = self.get_cell(coords)
+        index = cell.index
 
-        if cell.is_void or cell.was_shot:
+        if self._void[index] or self._shot[index]:
             raise FieldException(f"{self}: {cell} is not valid target")
         
-        cell.was_shot = True
-        
-        if cell.occupied_by is None:
-            return CellStatus.MISS
+        self._shot[index] = 1
         
-        occupier = cell.occupied_by
+        occupier = self._occupant(index)
+        if undo is not None:
+            if occupier is None:
+                undo.append((self, index, None, 0, None, self.zobrist))
+            else:
+                undo.append((self, index, occupier, occupier._damage, occupier._status, self.zobrist))
+
+        if occupier is None:
+            result = CellStatus.MISS
         
-        if occupier.type == EntityType.PLANET:
+        elif occupier.type == EntityType.PLANET:
             
             if coords == occupier.anchor: # planet direct hit
-                return CellStatus.HIT
+                result = CellStatus.HIT
             else:
-                return CellStatus.MISS # planet's orbit
+                result = CellStatus.MISS # planet's orbit
         
         # relay returns non-hit status for Game
         # it allows to detect relay hit and Game returns it back into shooter's field
         elif occupier.type == EntityType.RELAY:
             occupier.make_damage(coords)
-            return CellStatus.RELAY
+            result = CellStatus.RELAY
         
         else:
             occupier.make_damage(coords)
-            return CellStatus.HIT
+            result = CellStatus.HIT
+        
+        self.zobrist ^= zobrist_key(result, coords)
+        return result
+        
+
+    def undo_shot(self, index: int, occupier, damage: int, status: EntityStatus, zobrist: int) -> None:
+        """
+        Takes back shot recorded by take_shot(): cell becomes not shot, occupier gets it's damage and status back.
+        Owner's counters of destroyed entities are restored by owner.
+        """
+        self._shot[index] = 0
+        self.zobrist = zobrist
+        if occupier is not None:
+            occupier._damage = damage
+            occupier._status = status
         
 
     def __iter__(self):
-        return iter(self._cells.keys())
+        width = self.dimensions["width"]
+        return (divmod(index, width) for index in range(len(self._void)))
 
     def __repr__(self):
         return f"{self.name}'s field"
\ No newline at end of file
@@ -1,23 +1,46 @@
 import logging
 import random
+from dataclasses import dataclass
 from typing import Optional
 
 from modules.core.player import Player
+from modules.core.autoplace import LayoutSolver, AUTOPLACE_STRATEGIES
+from modules.core.feasibility import check_fleet
 
 from modules.common.events import Event, LobbyEvent, PlaceEvent, ShotEvent
+from modules.common.event_store import EventStore, MemoryEventStore, ForkEventStore
 from modules.common.exceptions import GameException, FieldException
-from modules.common.enums import GameState, EntityType, EntityStatus, CellStatus, EventType, LobbyEventType
-from modules.common.utils import invert_output
+from modules.common.enums import GameState, EntityType, CellStatus, EventType, LobbyEventType, PlacementStatus, FeasibilityStatus
+from modules.common.utils import invert_output, orbit_offsets
+from modules.common.zobrist import rotate_left, SIDE_TO_MOVE, TURN_PARITY
 
 
 logger = logging.getLogger()
 
+SHOT_REACTION = "Relay and Planets reaction" # shooter of event about shooter's own field, it goes first in shot events pair
+
+
+@dataclass(frozen=True, slots=True)
+class ShotUndo:
+    """
+    Everything Game.shoot() changed - enough to take the shot back without replaying the game.
+    """
+    turn: int
+    order: tuple[str, ...]
+    state: GameState
+    winner: Optional[str]
+    events: int # amount of events before the shot
+    cells: list[tuple] # what Field.take_shot() recorded for every shot cell
+    players: list[tuple[Player, tuple]] # (player, Player.save_state())
+
 
 class Game:
     """
     Manages players and their rights. Interface for renderer structures - CLI or endpoints.
+    With record_undo=True every shot keeps what it changed, so it can be taken back by undo().
+    It's off by default: records cost a copy of players state per shot and live as long as the game.
     """
-    def __init__(self, id: str = "Game"):
+    def __init__(self, id: str = "Game", event_store: Optional[EventStore] = None, *, record_undo = False):
         
         if not id or id is None:
             self.id = "Game"
@@ -31,15 +54,38 @@ class Game:
         self.state = GameState.LOBBY
         
         self.winner: str = None # name of winner if there any # type: ignore
-        self.events: list[Event] = []
+        self.events: EventStore = event_store if event_store is not None else MemoryEventStore() # e.g. JournalEventStore for long games
+        self._destroyed_cells_views: dict[str, tuple[Player, int, frozenset]] = {} # {name: (player, cells amount, cells set)}
+        self.record_undo = record_undo
+        self._undo: list[ShotUndo] = [] # one record per shot made while record_undo is on, the latest last
+
+
+    def fork(self) -> "Game":
+        """
+        Returns independent copy of the game to try moves on: whatever happens in fork doesn't affect this game and vice versa.
+        Immutable parts - field masks, entity geometry, orbit tables and history before fork - are shared,
+        only cells state arrays and entity states are copied.
+        """
+        clone = Game.__new__(Game)
+        clone.id = self.id
+        clone._players = {name: player.fork() for name, player in self._players.items()}
+        clone.order = self.order[:]
+        clone.turn = self.turn
+        clone.state = self.state
+        clone.winner = self.winner
+        clone.events = ForkEventStore(self.events)
+        clone._destroyed_cells_views = {}
+        clone.record_undo = self.record_undo
+        clone._undo = [] # records point to objects of this game
+        return clone
 
 
     def _append_event(self, event: Event):
         """
-        Appends event to event listm logs it and returns event to caller.
+        Appends event to event store, logs it and returns event to caller.
         """
-        self.events.append(event)
-        logger.debug(f"Event {len(self.events)}: {event}")
+        index = self.events.append(event)
+        logger.debug(f"Event {index + 1}: {event}")
         return event        
 
 
@@ -54,7 +100,7 @@ class Game:
             event_type=EventType.LOBBY,
             player_1=names[0] if names else None,
             player_2=names[1] if len(names) > 1 else None,
-            turn_order=self.order,
+            turn_order=list(self.order), # snapshot - order is reversed during the game
             winner=self.winner,
             lobby_event=lobby_event,
             payload=payload,
@@ -134,18 +180,12 @@ class Game:
         """
         player = self._get_player(name)
 
-        destroyed_cells = []
-        for entity in player.entities.values():
-            if entity.status == EntityStatus.DESTROYED and entity.type != EntityType.PLANET:
-                for coords in entity.cells_occupied:
-                    destroyed_cells.append(coords)
-        
         return {
             "name": player.name,
             "color": player.color,
             "order": self.order.index(player.name),
-            "pending": player.pending_entities,
-            "destroyed_cells": destroyed_cells,
+            "pending": dict(player.pending_entities), # snapshot - pending entities change during setup
+            "destroyed_cells": list(player.destroyed_cells),
             "shape": player.field.shape,
             "height": player.field.dimensions["height"],
             "width": player.field.dimensions["width"],
@@ -153,6 +193,41 @@ class Game:
         }
 
 
+    def get_destroyed_cells(self, name: str) -> frozenset[tuple[int, int]]:
+        """
+        Returns all cells of player's destroyed ships and relays.
+        Set is rebuilt only after something new is destroyed.
+        """
+        player = self._get_player(name)
+
+        cached = self._destroyed_cells_views.get(name)
+        if cached is None or cached[0] is not player or cached[1] != len(player.destroyed_cells):
+            cached = (player, len(player.destroyed_cells), frozenset(player.destroyed_cells))
+            self._destroyed_cells_views[name] = cached
+        return cached[2]
+
+
+    def zobrist(self, name: str) -> int:
+        """
+        64-bit hash of position as player with given name sees it: shot cells with results and planets positions
+        of both sides, who shoots next and turn parity. Hidden ships layout of opponent doesn't count.
+        Maintained incrementally by shots and planet moves, so it's O(1) to get. Use as TranspositionTable key.
+        Opponent's part is rotated by it's seat (order of joining), so the same facts of two opponents don't cancel each other.
+        """
+        player = self._get_player(name)
+        zobrist = player.zobrist
+
+        for seat, opponent in enumerate(self._players.values()):
+            if opponent is not player:
+                zobrist ^= rotate_left(opponent.zobrist, 1 + seat) # the same facts on opponent's side give other hash
+        
+        if self.state == GameState.ACTIVE and self.whos_turn() == player.name:
+            zobrist ^= SIDE_TO_MOVE
+        if self.turn % 2:
+            zobrist ^= TURN_PARITY
+        return zobrist
+
+
     def set_player(self, name: str, color: str) -> LobbyEvent:
         """
         Names are unique identificators.
@@ -176,6 +251,21 @@ class Game:
         return event
 
 
+    def add_player(self, player: Player) -> None:
+        """
+        Adds existing player instance as is - no checks, no turn order changes and no events.
+        For restoring recorded games (see Replay), which set order and record events themselves.
+        """
+        self._players[player.name] = player
+
+
+    def remove_player(self, name: str) -> Player:
+        """
+        Counterpart of add_player(): removes player without checks and events. Returns removed player.
+        """
+        return self._players.pop(name)
+
+
     def del_player(self, name: str) -> LobbyEvent:
         """
         Completely deletes player from the game. Moves order so 2nd player becomes 1st.
@@ -244,9 +334,21 @@ class Game:
         return event
 
 
-    def place_entity(self, name: str, etype: EntityType, coords: tuple, r: int) -> PlaceEvent:
+    def place_entity(
+        self,
+        name: str,
+        etype: EntityType,
+        coords: tuple,
+        r: int,
+        rotation: Optional[int] = None,
+        position: Optional[int] = None,
+        *,
+        probed = False,
+    ) -> PlaceEvent:
         """
         Tries to place entity to coords with rotation or radius r.
+        Planet's rotation (direction) and starting position on orbit are random unless given.
+        Placement is probed by Field.can_place() first, probed=True skips it when caller already did (see Player.place_entity()).
         If no GameException or FieldException met - returns event dict.
         """
         self.check_state(GameState.SETUP)
@@ -257,7 +359,7 @@ class Game:
         if player.pending_entities[EntityType.PLANET] > 0 and etype != EntityType.PLANET:
             raise GameException(f"{player} must place planets first")
         
-        entity_metadata = player.place_entity(etype, [coords, r])
+        entity_metadata = player.place_entity(etype, [coords, r, rotation, position], probed)
         
         radius, orbit_cells, orbit_center = None, None, None
         if entity_metadata["etype"] == EntityType.PLANET:
@@ -279,12 +381,67 @@ class Game:
         return event
 
 
-    def autoplace(self, name: str) -> tuple[list[PlaceEvent], str]:
+    def autoplace(
+        self,
+        name: str,
+        strategy: str = "backtrack",
+        seed: Optional[int] = None,
+        *,
+        workers: int = 1,
+        timeout: Optional[float] = None,
+    ) -> tuple[list[PlaceEvent], str]:
         """
         Autoplaces all remaining ships of player.
+        Strategies:
+        "backtrack" - solves whole layout first with constraint search and places it only when it's found;
+        "random" - tries random placements one by one until everything is placed or attempts limit is reached.
+        Seed makes layout reproducible.
+        workers > 1 runs that many independently seeded "backtrack" searches in process pool
+        and takes layout of the lowest numbered one which found it, so seeded result doesn't depend on scheduling.
+        timeout (seconds) limits "backtrack" search, single or parallel.
         Returns tuple: list of placement events proceeded during autoplace and summary.
         """
+        self.check_state(GameState.SETUP)
         player = self._get_player(name)
+        
+        match strategy:
+            case "backtrack":
+                return self._autoplace_backtrack(player, seed, workers, timeout)
+            case "random":
+                return self._autoplace_random(player, random if seed is None else random.Random(seed))
+            case _:
+                raise GameException(f"No {strategy} autoplace strategy. Supported: {', '.join(AUTOPLACE_STRATEGIES)}")
+
+
+    def _autoplace_backtrack(self, player: Player, seed: Optional[int], workers: int, timeout: Optional[float]) -> tuple[list[PlaceEvent], str]:
+        """
+        Places layout found by LayoutSolver. Nothing is placed if solver fails.
+        Layout is applied through place_entity either way, so events are the same as for manual placement.
+        """
+        # pool copies are bounded by solve_parallel() waiting, single search bounds itself
+        solver = LayoutSolver.from_field(player.field, player.pending_entities, seed=seed, time_limit=None if workers > 1 else timeout)
+        if workers > 1:
+            layout = solver.solve_parallel(workers, timeout)
+        else:
+            layout = solver.solve()
+        
+        if layout is None:
+            logger.info(f"Autoplacement for {player} failed: {solver.steps} steps, {solver.backtracks} backtracks, {solver.restarts} restarts.")
+            if solver.timed_out:
+                return ([], f"Unable to autoplace all entities - layout search timed out ({timeout}s)")
+            return ([], f"Unable to autoplace all entities - no layout found ({solver.backtracks} backtracks, {solver.restarts} restarts)")
+        
+        autoplace_events = [self.place_entity(player.name, etype, anchor, r, *motion) for etype, anchor, r, *motion in layout]
+        
+        logger.info(f"Autoplacement for {player} finished in {solver.steps} steps, {solver.backtracks} backtracks, {solver.restarts} restarts.")
+        return (autoplace_events, f"Autoplacement successfull. Took {solver.steps} steps and {solver.backtracks} backtracks")
+
+
+    def _autoplace_random(self, player: Player, rng) -> tuple[list[PlaceEvent], str]:
+        """
+        Rejection sampling of random placements.
+        """
+        name = player.name
         autoplace_events = []
         attempts_limit = 50000
         all_attempts_counter = 0
@@ -308,15 +465,21 @@ class Game:
                     counter += 1
                     all_attempts_counter += 1
                     try:
-                        y = random.randint(0, player.field.dimensions["height"] - 1)
-                        x = random.randint(0, player.field.dimensions["width"] - 1) 
+                        y = rng.randint(0, player.field.dimensions["height"] - 1)
+                        x = rng.randint(0, player.field.dimensions["width"] - 1) 
                         
                         if entity == EntityType.PLANET:
-                            r = random.randint(3, int(max(player.field.dimensions["height"], player.field.dimensions["width"])/2))
+                            r = rng.randint(3, int(max(player.field.dimensions["height"], player.field.dimensions["width"])/2))
                         else: 
-                            r = random.randint(0, 3)
+                            r = rng.randint(0, 3)
+                        
+                        # rejected attempts are filtered by probe without raising and formatting exceptions
+                        if player.field.can_place(entity, (y, x), r) != PlacementStatus.OK:
+                            continue
                         
-                        event = self.place_entity(name, entity, (y, x), r)
+                        # planet's direction and start position come from the same generator, so seeded layout is reproducible
+                        motion = (rng.choice((1, -1)), rng.randrange(len(orbit_offsets(r)))) if entity == EntityType.PLANET else ()
+                        event = self.place_entity(name, entity, (y, x), r, *motion, probed=True)
                         logger.info(f"Autoplaced {event.entity_type}-{event.entity_id} on {counter} iteration.")
                         
                         autoplace_events.append(event)
@@ -346,8 +509,24 @@ class Game:
         names.remove(shooter.name)
         target = self._get_player(names[0])
 
+        # destroyed cells recorded after these marks are made by this shot
+        shooter_destroyed, target_destroyed = len(shooter.destroyed_cells), len(target.destroyed_cells)
+
+        cells_undo, undo = None, None
+        if self.record_undo:
+            cells_undo = []
+            undo = ShotUndo(
+                turn=self.turn,
+                order=tuple(self.order),
+                state=self.state,
+                winner=self.winner,
+                events=len(self.events),
+                cells=cells_undo,
+                players=[(player, player.save_state()) for player in self._players.values()],
+            )
+
         # shot itself
-        result = target.take_shot(coords)
+        result = target.take_shot(coords, cells_undo)
         
         target_field_updates, shooter_field_updates = {}, {}
         match result:
@@ -362,7 +541,7 @@ class Game:
                 target_field_updates.update({coords: CellStatus.HIT})
                 # making reflected shot into same coordinates
                 try:
-                    reverse_shot_result = shooter.take_shot(coords)
+                    reverse_shot_result = shooter.take_shot(coords, cells_undo)
                     shooter_field_updates.update({coords: reverse_shot_result})
                     
                     # checking unique game ending - infinite reflection when relays placed on same coords in different fields
@@ -395,8 +574,8 @@ class Game:
         
         if not self.winner or self.winner is None:
                 # checking if game ended
-                shooter_is_destroyed = all(EntityStatus.DESTROYED == entity.status for entity in shooter.entities.values() if entity.type != EntityType.PLANET)
-                target_is_destroyed = all(EntityStatus.DESTROYED == entity.status for entity in target.entities.values() if entity.type != EntityType.PLANET)
+                shooter_is_destroyed = shooter.is_defeated
+                target_is_destroyed = target.is_defeated
                 if shooter_is_destroyed and target_is_destroyed:
                     self.state = GameState.OVER
                     self.winner = "Draw"
@@ -408,12 +587,12 @@ class Game:
                     self.winner = shooter.name  
         
         shooter_event = self.add_shot_event(
-            shooter="Relay and Planets reaction",
+            shooter=SHOT_REACTION,
             target=shooter.name,
             coords=coords,
             shot_results=shooter_field_updates,
             planets_anchors=shooter_planets_positions,
-            destroyed_cells=self.get_player_meta(shooter.name)["destroyed_cells"]
+            destroyed_cells=shooter.destroyed_cells[shooter_destroyed:]
         )
         target_event = self.add_shot_event(
             shooter=shooter.name,
@@ -421,29 +600,58 @@ class Game:
             coords=coords,
             shot_results=target_field_updates,
             planets_anchors=target_planets_positions,
-            destroyed_cells=self.get_player_meta(target.name)["destroyed_cells"]
+            destroyed_cells=target.destroyed_cells[target_destroyed:]
         )
-        logger.info(f"{shooter} shot {shooter.field.get_cell(coords)}: {result}")
+        if undo is not None:
+            self._undo.append(undo)
+        logger.info(f"{shooter} shot {invert_output(coords)}: {result}") # coords may be not a part of shooter's field
+        return (shooter_event, target_event)
+
+
+    def undo(self) -> tuple[ShotEvent, ShotEvent]:
+        """
+        Takes the last shot back: cells, entities, planets, turn, order, winner and state become as they were before it,
+        and it's events are removed from history. Costs as much as the shot changed.
+        Returns removed events in the same order as shoot() returned them.
+        Only shots made while record_undo was on can be taken back.
+        """
+        if not self._undo:
+            if not self.record_undo:
+                raise GameException("No shots to undo: undo isn't recorded, set record_undo to record it")
+            raise GameException("No shots to undo")
+        
+        undo = self._undo[-1]
+        if len(self.events) != undo.events + 2:
+            raise GameException("Can't undo the shot: there are events after it")
+        
+        shooter_event, target_event = self.events[undo.events:] # type: ignore
+        self._undo.pop()
+
+        for field, *cell in reversed(undo.cells):
+            field.undo_shot(*cell)
+        for player, state in undo.players:
+            player.restore_state(state)
+        
+        self.turn = undo.turn
+        self.order = list(undo.order)
+        self.state = undo.state
+        self.winner = undo.winner
+        self.events.truncate(undo.events)
+        self._destroyed_cells_views.clear() # destroyed cells amount may repeat with other cells
+
+        logger.info(f"Shot of {target_event.shooter} on {invert_output(target_event.coords)} undone")
         return (shooter_event, target_event)
 
 
-    def ready(self) -> LobbyEvent:
+    def ready(self, exact_time_limit = 0.5) -> LobbyEvent:
         """
         Tries to proceed to setup state if possible.
-        TODO: move sizes into entity instance
+        Checks that every player's entities can be placed on their field.
+        exact_time_limit - seconds for exhaustive search when quick checks can't decide; 0 disables it.
         """
         self.check_state(GameState.LOBBY)
         if len(self._players) != 2:
             raise GameException("Must be 2 players to initialize setup state")
-        
-        sizes = {
-            EntityType.CORVETTE: 1,
-            EntityType.FRIGATE: 2,
-            EntityType.DESTROYER: 3,
-            EntityType.CRUISER: 4,
-            EntityType.PLANET: 1,
-            EntityType.RELAY: 1,
-        }
 
         players_meta = []
 
@@ -452,21 +660,15 @@ class Game:
             if cells_available == 0:
                 raise GameException(f"Can't initialize setup state: {player} doesn't have a field")
 
-            estimated_cells = 0
-            for etype, amount in player.pending_entities.items():
-                # empirical formula which allows to roughly evaluate if these objects can fit on given field
-                # in average, it there'd be no planets we can evaluate how much one ship takes -  is 3 times it's length
-                # that's 6 tiles (front and back + 4 diagonals) less than it actually needs, but it assumes that ships can be placed next to broder field
-                # which is removes part of needed tiles
-                # 0.4 there represents planets' orbits. They're chaotic and can be placed next tot ships that's where 3.4 comes from
-                # that formula - is termporary solution, but kinda working
-                estimated_cells += 3.4 * amount * sizes[etype]
+            if not any(player.pending_entities.values()):
+                raise GameException(f"Can't initialize setup state: {player} doesn't have pending entities list")
             
-            if estimated_cells >= cells_available:
-                raise GameException(f"Can't initialize setup state: {player} wouldn't be able to place all it's entities. Change amount or entity types {estimated_cells}>={cells_available}")
+            feasibility = check_fleet(player.field, player.pending_entities, exact_time_limit=exact_time_limit)
+            if feasibility.status == FeasibilityStatus.DOESNT_FIT:
+                raise GameException(f"Can't initialize setup state: {player} wouldn't be able to place all it's entities. Change amount or entity types: {feasibility.reason}")
             
-            if estimated_cells == 0:
-                raise GameException(f"Can't initialize setup state: {player} doesn't have pending entities list")
+            if feasibility.status == FeasibilityStatus.UNKNOWN:
+                logger.info(f"Entities of {player} are not proven to fit: {feasibility.reason}")
             
             players_meta.append(self.get_player_meta(player.name))
 
@@ -0,0 +1,153 @@
+from modules.common.enums import EntityType
+
+
+# ships and relays sizes in cells, planets occupy cells only by their orbits
+ENTITY_SIZES = {
+    EntityType.CORVETTE: 1,
+    EntityType.FRIGATE: 2,
+    EntityType.DESTROYER: 3,
+    EntityType.CRUISER: 4,
+    EntityType.RELAY: 1,
+}
+MAX_ENTITY_SIZE = max(ENTITY_SIZES.values())
+
+# (dy, dx) for rotations 0, 1, 2, 3 - same order as Entity.rotation_manage
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+class PlacementIndex:
+    """
+    Incremental index of legal anchors for ships and relays of every size and rotation.
+    Cell is free for entity body when it's not void, not occupied by anything (orbits included)
+    and no ship or relay occupies any of it's 8 neighbours.
+    runs[rotation][index] stores how many free cells in a row start from index in rotation direction.
+    Runs are capped by MAX_ENTITY_SIZE, so entity of size s fits anchor when runs[rotation][index] >= s.
+    Placement only ever takes cells away, so every update touches only cells around placed entity.
+    """
+    def __init__(self, height: int, width: int, void: bytes, occupants, entities: dict):
+        self.height, self.width = height, width
+        size = max(height, 0) * max(width, 0)
+
+        self.free = bytearray(size)
+        for index in range(size):
+            if not void[index] and occupants[index] == -1:
+                self.free[index] = 1
+
+        # ship and relay halo takes neighbour cells away
+        for index in range(size):
+            entity = entities.get(occupants[index])
+            if entity is not None and entity.type != EntityType.PLANET:
+                for neighbour in self._neighbours(index):
+                    self.free[neighbour] = 0
+
+        self.runs = [self._build_runs(dy, dx) for dy, dx in DIRECTIONS]
+
+
+    def copy(self) -> "PlacementIndex":
+        """
+        Returns independent index which can be changed without affecting this one.
+        """
+        index = PlacementIndex.__new__(PlacementIndex)
+        index.height, index.width = self.height, self.width
+        index.free = self.free[:]
+        index.runs = [runs[:] for runs in self.runs]
+        return index
+
+
+    def _build_runs(self, dy: int, dx: int) -> bytearray:
+        """
+        Counts free cells in a row for every cell walking against direction,
+        so run of the next cell is always known before current one.
+        """
+        height, width = self.height, self.width
+        runs = bytearray(len(self.free))
+
+        ys = range(height - 1, -1, -1) if dy > 0 else range(height)
+        xs = range(width - 1, -1, -1) if dx > 0 else range(width)
+        step = dy * width + dx
+
+        for y in ys:
+            next_y_inside = 0 <= y + dy < height
+            for x in xs:
+                index = y * width + x
+                if not self.free[index]:
+                    continue
+                if next_y_inside and 0 <= x + dx < width:
+                    runs[index] = min(MAX_ENTITY_SIZE, runs[index + step] + 1)
+                else:
+                    runs[index] = 1
+        return runs
+
+
+    def _neighbours(self, index: int) -> list[int]:
+        """
+        Returns flat indexes of cell itself and all it's neighbours within field bounds.
+        """
+        y, x = divmod(index, self.width)
+        return [
+            ny * self.width + nx
+            for ny in range(max(y - 1, 0), min(y + 2, self.height))
+            for nx in range(max(x - 1, 0), min(x + 2, self.width))
+        ]
+
+
+    def _take(self, index: int) -> None:
+        """
+        Marks cell as not free and shortens runs which were passing through it.
+        """
+        if not self.free[index]:
+            return
+        self.free[index] = 0
+
+        y, x = divmod(index, self.width)
+        for rotation, (dy, dx) in enumerate(DIRECTIONS):
+            runs = self.runs[rotation]
+            runs[index] = 0
+
+            for distance in range(1, MAX_ENTITY_SIZE):
+                by, bx = y - distance*dy, x - distance*dx
+                if not (0 <= by < self.height and 0 <= bx < self.width):
+                    break
+
+                behind = by * self.width + bx
+                if runs[behind] <= distance:
+                    break # run was already cut before this cell
+                runs[behind] = distance
+
+
+    def occupy(self, indexes, *, halo = True) -> None:
+        """
+        Updates index after entity placed on given cells.
+        Ships and relays take their neighbours too (halo), planet orbits don't.
+        """
+        for index in indexes:
+            if halo:
+                for neighbour in self._neighbours(index):
+                    self._take(neighbour)
+            else:
+                self._take(index)
+
+
+    def is_legal(self, size: int, anchor: tuple[int, int], rotation: int) -> bool:
+        """
+        O(1) check if entity of given size can be placed on anchor with rotation.
+        """
+        y, x = anchor
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            return False
+        return self.runs[rotation % 4][y * self.width + x] >= size
+
+
+    def legal_anchors(self, size: int, rotation: int) -> list[tuple[int, int]]:
+        """
+        Returns all (y, x) where entity of given size can be placed with given rotation.
+        """
+        width = self.width
+        return [divmod(index, width) for index, run in enumerate(self.runs[rotation % 4]) if run >= size]
+
+
+    def legal_placements(self, size: int) -> list[tuple[tuple[int, int], int]]:
+        """
+        Returns all ((y, x), rotation) pairs where entity of given size can be placed.
+        """
+        return [(anchor, rotation) for rotation in range(4) for anchor in self.legal_anchors(size, rotation)]
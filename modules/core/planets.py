@@ -0,0 +1,189 @@
+import logging
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional - pure python backend is used without it
+    np = None
+
+from modules.core.entities import Planet
+
+from modules.common.enums import CellStatus, EntityStatus
+from modules.common.utils import invert_output
+from modules.common.zobrist import zobrist_key
+
+
+logger = logging.getLogger(__name__)
+
+HAS_NUMPY = np is not None
+NUMPY_MIN_PLANETS = 256 # below that numpy call overhead costs more than python loop
+
+
+class PlanetSystem:
+    """
+    Array-backed state of all player's planets which moves them all in one step.
+    Orbits are flattened into one array with start offset and length for each planet,
+    positions and directions are kept in arrays too, so moving is (position + step * direction) % length for every planet
+    and collisions are coords met more than once.
+    With numpy installed and enough planets both are done by vectorized operations, otherwise by plain loop over lists.
+    Planet objects are synced after every step, but system doesn't watch them:
+    while it's used, planets must be moved only by it. Owner rebuilds it when planets set changes.
+    """
+    def __init__(self, planets: list[Planet], *, use_numpy: Optional[bool] = None, name = "Unknown"):
+        self.name = str(name) # owner name for logs
+        self.planets = planets
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY and len(planets) >= NUMPY_MIN_PLANETS
+        self.use_numpy = use_numpy and HAS_NUMPY
+
+        orbit_y, orbit_x, starts, lengths = [], [], [], []
+        for planet in planets:
+            starts.append(len(orbit_y))
+            lengths.append(len(planet.orbit_cells))
+            for y, x in planet.orbit_cells:
+                orbit_y.append(y)
+                orbit_x.append(x)
+
+        positions = [planet.position for planet in planets]
+        directions = [planet.rotation for planet in planets]
+        alive = [planet.status != EntityStatus.DESTROYED for planet in planets]
+
+        self.zobrist = 0 # XOR of zobrist keys of alive planets anchors, updated by every move
+        for planet, is_alive in zip(planets, alive):
+            if is_alive:
+                self.zobrist ^= zobrist_key(CellStatus.PLANET, planet.anchor)
+
+        if self.use_numpy:
+            self.orbit_y, self.orbit_x = np.array(orbit_y, dtype=np.int64), np.array(orbit_x, dtype=np.int64)
+            self.starts, self.lengths = np.array(starts, dtype=np.int64), np.array(lengths, dtype=np.int64)
+            self.positions = np.array(positions, dtype=np.int64)
+            self.directions = np.array(directions, dtype=np.int64)
+            self.alive = np.array(alive, dtype=bool)
+
+            # coords are packed into single int for collision search, off-field orbit coords may be negative
+            self._min_y = int(self.orbit_y.min()) if orbit_y else 0
+            self._min_x = int(self.orbit_x.min()) if orbit_x else 0
+            self._span_x = int(self.orbit_x.max()) - self._min_x + 1 if orbit_x else 1
+        else:
+            self.orbit_y, self.orbit_x = orbit_y, orbit_x
+            self.starts, self.lengths = starts, lengths
+            self.positions, self.directions, self.alive = positions, directions, alive
+
+
+    def fork(self, planets: list[Planet]) -> "PlanetSystem":
+        """
+        Returns system for copies of planets (in the same order) of forked game.
+        Orbit tables are shared, only positions and alive flags are copied.
+        """
+        clone = PlanetSystem.__new__(PlanetSystem)
+        clone.__dict__.update(self.__dict__)
+        clone.planets = planets
+        clone.positions = self.positions.copy()
+        clone.alive = self.alive.copy()
+        return clone
+
+
+    def save_state(self) -> tuple:
+        """
+        Returns what step() changes: arrays of positions and alive flags, hash and (position, anchor, status) of every planet.
+        """
+        planets = tuple((planet._position, planet.anchor, planet._status) for planet in self.planets)
+        return (self.positions.copy(), self.alive.copy(), self.zobrist, planets)
+
+
+    def restore_state(self, state: tuple) -> None:
+        """
+        Puts system and it's planets back to state returned by save_state().
+        """
+        positions, alive, self.zobrist, planets = state
+        self.positions, self.alive = positions.copy(), alive.copy() # state may be restored more than once
+        for planet, (position, anchor, status) in zip(self.planets, planets):
+            planet._position = position
+            planet.anchor = anchor
+            planet._status = status
+
+
+    def step(self, value = 1) -> dict[tuple[int, int], CellStatus]:
+        """
+        Moves all alive planets on their orbits by value and destroys collided ones.
+        Returns the same {coords: status} as Player.move_planets: planet anchors first, collision cells rewritten as hit.
+        Zobrist hash is updated by one XOR per moved or destroyed planet.
+        """
+        if self.use_numpy:
+            moved, positions, anchors, collided = self._step_numpy(value)
+        else:
+            moved, positions, anchors, collided = self._step_python(value)
+
+        planets = self.planets
+        zobrist = self.zobrist
+        for number, position, anchor in zip(moved, positions, anchors):
+            planet = planets[number]
+            zobrist ^= zobrist_key(CellStatus.PLANET, planet.anchor) ^ zobrist_key(CellStatus.PLANET, anchor)
+            planet._position = position
+            planet.anchor = anchor
+        
+        updated_cells = dict.fromkeys(anchors, CellStatus.PLANET)
+
+        if collided:
+            groups: dict[tuple[int, int], list[Planet]] = {}
+            for number in collided:
+                planet = self.planets[number]
+                groups.setdefault(planet.anchor, []).append(planet)
+                zobrist ^= zobrist_key(CellStatus.PLANET, planet.anchor)
+                planet.status = EntityStatus.DESTROYED
+
+            for anchor, group in groups.items():
+                updated_cells[anchor] = CellStatus.HIT # rewrites information on this cell as hit event
+                logger.info(f"{self.name} {invert_output(anchor)} - collision of {len(group)} planets: {group}")
+
+        self.zobrist = zobrist
+        return updated_cells
+
+
+    def _step_python(self, value: int) -> tuple[list[int], list[int], list[tuple[int, int]], list[int]]:
+        """
+        Returns (numbers of moved planets, their new positions, their new anchors, numbers of collided planets).
+        """
+        positions, orbit_y, orbit_x = self.positions, self.orbit_y, self.orbit_x
+        moved, moved_positions, anchors = [], [], []
+        seen: dict[tuple[int, int], int] = {} # {anchor: how many planets are there}
+
+        for number, is_alive in enumerate(self.alive):
+            if not is_alive:
+                continue
+            position = (positions[number] + value * self.directions[number]) % self.lengths[number]
+            positions[number] = position
+
+            flat = self.starts[number] + position
+            anchor = (orbit_y[flat], orbit_x[flat])
+            moved.append(number)
+            moved_positions.append(position)
+            anchors.append(anchor)
+            seen[anchor] = seen.get(anchor, 0) + 1
+
+        collided = [number for number, anchor in zip(moved, anchors) if seen[anchor] > 1]
+        for number in collided:
+            self.alive[number] = False
+        return (moved, moved_positions, anchors, collided)
+
+
+    def _step_numpy(self, value: int) -> tuple[list[int], list[int], list[tuple[int, int]], list[int]]:
+        """
+        Same as _step_python but every planet is processed by one array operation.
+        """
+        moved = np.flatnonzero(self.alive)
+        if moved.size == 0:
+            return ([], [], [], [])
+
+        positions = (self.positions[moved] + value * self.directions[moved]) % self.lengths[moved]
+        self.positions[moved] = positions
+
+        flat = self.starts[moved] + positions
+        ys, xs = self.orbit_y[flat], self.orbit_x[flat]
+
+        keys = (ys - self._min_y) * self._span_x + (xs - self._min_x)
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        collided = moved[counts[inverse] > 1]
+        self.alive[collided] = False
+
+        return (moved.tolist(), positions.tolist(), list(zip(ys.tolist(), xs.tolist())), collided.tolist())
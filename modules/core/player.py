@@ -1,12 +1,13 @@
 import logging
 from itertools import combinations
+from typing import Optional
 
 from modules.core.field import Field
 from modules.core.entities import Entity, Ship, Planet, Relay
+from modules.core.planets import PlanetSystem
 
-from modules.common.enums import CellStatus, EntityType, EntityStatus
+from modules.common.enums import CellStatus, EntityType, EntityStatus, PlacementStatus
 from modules.common.exceptions import PlayerException
-from modules.common.utils import invert_output
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,9 @@ class Player:
         }
 
         self.entities: dict[int, Entity] = {} # actual set entities {Entity.eid: Entity}
+        self.alive = 0 # amount of placed ships and relays which are not destroyed yet
+        self.destroyed_cells: list[tuple[int, int]] = [] # cells of destroyed ships and relays in order of destruction
+        self._planet_system: PlanetSystem | None = None # built on first planets move after planets set changed
 
         self.field = Field(name=self.name)
         self.colorize(color)
@@ -49,6 +53,30 @@ class Player:
             logger.info(f"{self} tried to be unsupported {color}. Changed it to {self.color} instead")
 
 
+    def fork(self) -> "Player":
+        """
+        Returns independent copy of player for forked game: entities, field and planets are copied with shared geometry.
+        """
+        clone = Player.__new__(Player)
+        clone.name = self.name
+        clone.color = self.color
+        clone.pending_entities = dict(self.pending_entities)
+        clone.alive = self.alive
+        clone.destroyed_cells = self.destroyed_cells[:]
+
+        clone.entities = {eid: entity.fork() for eid, entity in self.entities.items()}
+        for entity in clone.entities.values():
+            if entity.type != EntityType.PLANET:
+                entity.on_destroyed = clone._entity_destroyed
+        
+        clone.field = self.field.fork(clone.entities)
+
+        clone._planet_system = None
+        if self._planet_system is not None:
+            clone._planet_system = self._planet_system.fork([clone.entities[planet.eid] for planet in self._planet_system.planets])
+        return clone
+
+
     def get_entity(self, eid: int) -> Entity:
         """
         Returns entity instance by given entity id.
@@ -68,18 +96,27 @@ class Player:
         logger.info(f"Field {self.field} set for {self}")
 
 
-    def place_entity(self, etype: EntityType, params: list) -> dict:
+    def place_entity(self, etype: EntityType, params: list, probed = False) -> dict:
         """
         It creates entity instance - that's necessary for attempt to place entity where player has chosen.
         If attempt is not valid - this instace is left to garbage collector and not put to player.entities dict.
         Ships or Relay: params = [coords: tuple, rotation: int];
-        Planet: params = [coords: tuple, orbit_radius: int].
+        Planet: params = [coords: tuple, orbit_radius: int, rotation: int, position: int] - rotation and position are optional, random if not given.
         If placed - returns entity metadata dict.
+        Placement is probed by Field.can_place() before entity is created, so rejected attempt doesn't use up an entity id.
+        probed=True skips the probe - for callers which already got PlacementStatus.OK for the same placement.
         """
 
         if self.pending_entities[etype] <= 0:
             raise PlayerException(f"{self} has no {etype} available to place")
         
+        if not probed:
+            placement_status = self.field.can_place(etype, params[0], params[1])
+            if placement_status == PlacementStatus.UNSUPPORTED:
+                raise PlayerException(f"{etype} is not implemented")
+            if placement_status != PlacementStatus.OK:
+                raise self.field.placement_error(etype, params[0], params[1])
+        
         if etype in (
             EntityType.CORVETTE,
             EntityType.FRIGATE,
@@ -98,24 +135,67 @@ class Player:
         elif etype == EntityType.PLANET:
             coords = params[0]
             orbit_radius = params[1]
-            entity = Planet(orbit_radius, coords)
+            rotation = params[2] if len(params) > 2 else None
+            position = params[3] if len(params) > 3 else None
+            entity = Planet(orbit_radius, coords, rotation, position)
             self.field.setup_a_planet(entity)
         else:
             raise PlayerException(f"{etype} is not implemented")
         
-        self.pending_entities[etype] -= 1
-        self.entities[entity.eid] = entity
+        self.add_entity(entity)
         
         logger.info(f"{self} placed: {entity}")
 
         return entity.metadata
 
 
-    def take_shot(self, coords: tuple[int, int]) -> CellStatus:
+    def add_entity(self, entity: Entity) -> None:
+        """
+        Takes entity which is already placed on player's field as one of pending ones.
+        Nothing is checked - entity must be placed by player's field (see place_entity()).
+        """
+        self.pending_entities[entity.type] -= 1
+        self.entities[entity.eid] = entity
+        if entity.type != EntityType.PLANET:
+            entity.on_destroyed = self._entity_destroyed
+            self.alive += 1
+        else:
+            self._planet_system = None
+
+
+    def _entity_destroyed(self, entity: Entity) -> None:
+        """
+        Entity.on_destroyed hook for ships and relays.
+        """
+        self.alive -= 1
+        self.destroyed_cells.extend(entity.cells_occupied)
+        logger.debug(f"{self} lost {entity}, {self.alive} left")
+
+
+    @property
+    def is_defeated(self) -> bool:
+        """
+        O(1) check if all player's ships and relays are destroyed. Planets are decoys and don't count.
+        """
+        return self.alive == 0
+
+
+    def take_shot(self, coords: tuple[int, int], undo: Optional[list] = None) -> CellStatus:
         """
         Parses shot parameters to Field method.
         """
-        return self.field.take_shot(coords)
+        return self.field.take_shot(coords, undo)
+
+
+    @property
+    def planet_system(self) -> PlanetSystem:
+        """
+        Built on first demand after planets set changed.
+        """
+        if self._planet_system is None:
+            planets = [planet for planet in self.entities.values() if planet.type == EntityType.PLANET]
+            self._planet_system = PlanetSystem(planets, name=self.name) # type: ignore
+        return self._planet_system
 
 
     def move_planets(self, value = 1) -> dict[tuple[int, int], CellStatus]:
@@ -123,36 +203,67 @@ class Player:
         Moves all player's planets on their orbit by value.
         Returns dict {coords: status} with updated planets position.
         Manages with planet collision either.
+        All planets are moved at once by PlanetSystem (vectorized when numpy is available).
+        """
+        return self.planet_system.step(value)
+
+
+    @property
+    def zobrist(self) -> int:
+        """
+        Hash of what both players can know about player's side: shot cells with results and planets positions.
+        """
+        return self.field.zobrist ^ self.planet_system.zobrist
+
+
+    def save_state(self) -> tuple:
+        """
+        Returns compact record of what a move changes in player besides field cells:
+        alive counter, amount of destroyed cells and planets state.
+        Cells and entities damage are recorded by Field.take_shot().
+        """
+        return (self.alive, len(self.destroyed_cells), self.planet_system.save_state())
+
+
+    def restore_state(self, state: tuple) -> None:
+        """
+        Puts player back to state returned by save_state().
+        """
+        alive, destroyed, planets = state
+        self.alive = alive
+        del self.destroyed_cells[destroyed:]
+        self.planet_system.restore_state(planets)
+
+
+    def planet_schedule(self, turns: int) -> list[dict[tuple[int, int], CellStatus]]:
+        """
+        Predicts planets movement without moving them.
+        Returns list where i-th item is what move_planets() would return on (i+1)-th turn from now:
+        {coords: CellStatus.PLANET} for every planet anchor and CellStatus.HIT where planets collide.
+        Positions are computed directly from orbit, only planets lost in predicted collisions are tracked.
         """
-        
-        # gets all planets on the field which are not destroyed yet
         planets = [planet for planet in self.entities.values() if planet.type == EntityType.PLANET and planet.status != EntityStatus.DESTROYED]
         
-        updated_cells = {}
-        planets_sorted_by_anchors = {}
-        for planet in planets:
-            planet.position += value # moves planet forward on their orbits, usually with default step 1
-            updated_cells[planet.anchor[:]] = CellStatus.PLANET
-            
-            # sorts all planets in groups with their current position
-            try:
-                planets_sorted_by_anchors[planet.anchor[:]].append(planet)
-            except KeyError:
-                planets_sorted_by_anchors[planet.anchor[:]] = [planet]
-        
-        # if 2 planets on the same coords or more - destroys them
-        for anchor, group in planets_sorted_by_anchors.items():
-            if len(group) <= 1:
-                continue
-            
-            updated_cells[anchor] = CellStatus.HIT # rewrites information on this cell as hit event
+        schedule = []
+        for turn in range(1, turns + 1):
+            updated_cells = {}
+            planets_by_anchors: dict[tuple[int, int], list[Planet]] = {}
+            for planet in planets:
+                anchor = planet.orbit_cells[planet.position_at(turn)]
+                updated_cells[anchor] = CellStatus.PLANET
+                planets_by_anchors.setdefault(anchor, []).append(planet)
             
-            for planet in group:
-                planet.status = EntityStatus.DESTROYED
+            collided = set()
+            for anchor, group in planets_by_anchors.items():
+                if len(group) > 1:
+                    updated_cells[anchor] = CellStatus.HIT
+                    collided.update(planet.eid for planet in group)
             
-            logger.info(f"{self} {invert_output(anchor)} - collision of {len(group)} planets: {group}")
+            if collided:
+                planets = [planet for planet in planets if planet.eid not in collided]
+            schedule.append(updated_cells)
         
-        return updated_cells
+        return schedule
 
 
     def __str__(self):
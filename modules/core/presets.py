@@ -0,0 +1,91 @@
+import random
+
+from modules.common.enums import EntityType
+from modules.common.exceptions import GameException
+
+
+PRESETS = ("classic", "standart", "random", "planet_mayhem", "relay_madness")
+
+
+def get_preset(name: str) -> dict:
+    """
+    Returns one player's game options for given preset name:
+    {"entities": {EntityType: amount}, "shape": str, "params": [str, str]}.
+    "random" preset gives new options on every call.
+    """
+    match name:
+        case "classic":
+            return {
+                "entities": {
+                    EntityType.CORVETTE: 4,
+                    EntityType.FRIGATE: 3,
+                    EntityType.DESTROYER: 2,
+                    EntityType.CRUISER: 1,
+                },
+                "shape": "1",
+                "params": ["10", "10"],
+            }
+        
+        case "standart":
+            return {
+                "entities": {
+                    EntityType.CORVETTE: 5,
+                    EntityType.FRIGATE: 4,
+                    EntityType.DESTROYER: 3,
+                    EntityType.CRUISER: 2,
+                    EntityType.RELAY: 7,
+                    EntityType.PLANET: 1,
+                },
+                "shape": "1",
+                "params": ["12", "12"],
+            }
+        
+        case "random":
+            entities = {
+                EntityType.CORVETTE: random.randint(0, 10),
+                EntityType.FRIGATE: random.randint(0, 8),
+                EntityType.DESTROYER: random.randint(0, 5),
+                EntityType.CRUISER: random.randint(0, 3),
+                EntityType.RELAY: random.randint(0, 8),
+                EntityType.PLANET: random.randint(0, 4),
+            }
+            shape = str(random.choice((1, 2, 3, 4, 5, 6, 7)))
+            if shape == "1":
+                height = str(random.randint(10, 15))
+                width = str(random.randint(10, 15))
+            else:
+                height = str(random.randint(7, 10))
+                width = str(random.randint(1, 360))
+            
+            return {"entities": entities, "shape": shape, "params": [height, width]}
+
+        case "planet_mayhem":
+            return {
+                "entities": {
+                    EntityType.CORVETTE: 4,
+                    EntityType.FRIGATE: 0,
+                    EntityType.DESTROYER: 0,
+                    EntityType.CRUISER: 0,
+                    EntityType.RELAY: 0,
+                    EntityType.PLANET: 21,
+                },
+                "shape": "2",
+                "params": ["6", "0"],
+            }
+        
+        case "relay_madness":
+            return {
+                "entities": {
+                    EntityType.CORVETTE: 1,
+                    EntityType.FRIGATE: 0,
+                    EntityType.DESTROYER: 0,
+                    EntityType.CRUISER: 0,
+                    EntityType.RELAY: 40,
+                    EntityType.PLANET: 0,
+                },
+                "shape": "3",
+                "params": ["12", "145"],
+            }
+        
+        case _:
+            raise GameException(f"No {name} preset. Supported: {', '.join(PRESETS)}")
@@ -0,0 +1,226 @@
+import copy
+import logging
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import Optional
+
+from modules.core.game import Game, SHOT_REACTION
+from modules.core.player import Player
+from modules.core.field import Field, FieldMask
+from modules.core.entities import Entity, Ship, Planet, Relay
+
+from modules.common.events import Event, ShotEvent, LobbyEvent, PlaceEvent
+from modules.common.event_store import EventStore, MemoryEventStore, ForkEventStore
+from modules.common.enums import EntityType, LobbyEventType
+from modules.common.exceptions import GameException
+
+
+logger = logging.getLogger(__name__)
+
+
+class Replay:
+    """
+    Rebuilds game from it's recorded events.
+    Lobby and place events are applied directly, shots are made again through Game.shoot() and checked against recorded ones.
+    Every keyframe_interval events a snapshot of the game is kept, so getting state at any point of history
+    replays at most keyframe_interval (+1 to not split shot events pair) events after the nearest snapshot.
+    """
+    def __init__(self, events: Iterable[Event], keyframe_interval = 100, id = "Replay"):
+        if keyframe_interval < 1:
+            raise ValueError(f"Keyframe interval must be positive, not {keyframe_interval}")
+
+        self.events: EventStore = events if isinstance(events, EventStore) else MemoryEventStore(events)
+        self.keyframe_interval = keyframe_interval
+        self.id = id
+
+        self._keyframes: list[tuple[int, Game]] = [] # (amount of events applied, game snapshot) in order of history
+        self._keyframe_indexes: list[int] = []
+        self._turn_ends: list[int] = [0] # amount of events applied when turn (index) was finished
+
+        self.game = self._build() # final state
+
+
+    def _build(self) -> Game:
+        """
+        Single pass over whole history which takes keyframes on the way.
+        """
+        game = Game(self.id)
+        self._keep_keyframe(0, game)
+
+        reaction = None
+        applied = 0
+        for applied, event in enumerate(self.events, start=1):
+            reaction = self._apply(game, event, reaction)
+            if reaction is not None:
+                continue # shot pair is applied on it's second event
+
+            if game.turn < len(self._turn_ends):
+                self._turn_ends[game.turn] = applied
+            else:
+                self._turn_ends.append(applied)
+
+            if applied - self._keyframe_indexes[-1] >= self.keyframe_interval:
+                self._keep_keyframe(applied, game)
+
+        if reaction is not None:
+            logger.info(f"{self}: history ends with unpaired shot reaction, it's skipped")
+
+        logger.info(f"{self}: {applied} events replayed, {len(self._keyframes)} keyframes kept")
+        return game
+
+
+    def _keep_keyframe(self, applied: int, game: Game) -> None:
+        # event store isn't copied: replayed events are the same as recorded ones, restored game gets them from self.events
+        snapshot = copy.deepcopy(game, {id(game.events): None})
+        self._keyframes.append((applied, snapshot))
+        self._keyframe_indexes.append(applied)
+
+
+    @property
+    def turns(self) -> int:
+        """
+        Amount of turns made in replayed game.
+        """
+        return len(self._turn_ends) - 1
+
+
+    def game_at(self, applied: int) -> Game:
+        """
+        Returns new independent game as it was after first `applied` events. It has no shots to undo.
+        Shot is made only when second event of it's pair is in range.
+        History before the keyframe is read from self.events, so seeking costs no copying whatever it's length is.
+        """
+        applied = max(0, min(applied, len(self.events)))
+
+        start, snapshot = self._keyframes[bisect_right(self._keyframe_indexes, applied) - 1]
+        game = copy.deepcopy(snapshot)
+        game.events = ForkEventStore(self.events, start)
+
+        reaction = None
+        for event in self.events.range(start, applied):
+            reaction = self._apply(game, event, reaction)
+        return game
+
+
+    def seek(self, turn: int) -> Game:
+        """
+        Returns new independent game as it was at the end of given turn. 0 - before the first shot.
+        Turns out of range are clamped.
+        """
+        if turn < 0:
+            turn = 0
+        return self.game_at(self._turn_ends[min(turn, self.turns)])
+
+
+    def _apply(self, game: Game, event: Event, reaction: Optional[ShotEvent]) -> Optional[ShotEvent]:
+        """
+        Applies one event to game. Returns reaction shot event if it waits for the second event of it's pair.
+        """
+        if isinstance(event, ShotEvent):
+            if event.shooter == SHOT_REACTION:
+                if reaction is not None:
+                    raise GameException(f"{self}: shot reaction on turn {reaction.turn} isn't followed by a shot")
+                return event
+
+            if reaction is None:
+                raise GameException(f"{self}: shot of {event.shooter} on turn {event.turn} has no reaction event")
+
+            shooter_event, target_event = game.shoot(event.shooter, event.coords)
+            if shooter_event != reaction or target_event != event:
+                raise GameException(f"{self}: replay diverged on turn {event.turn}, {event.shooter} shot {event.coords}")
+            return None
+
+        if reaction is not None:
+            raise GameException(f"{self}: shot reaction on turn {reaction.turn} isn't followed by a shot")
+
+        if isinstance(event, PlaceEvent):
+            self._place(game, event)
+        elif isinstance(event, LobbyEvent):
+            self._lobby(game, event)
+        else:
+            raise GameException(f"{self}: can't replay {type(event).__name__}")
+
+        game.events.append(event)
+        return None
+
+
+    def _lobby(self, game: Game, event: LobbyEvent) -> None:
+        match event.lobby_event:
+            case LobbyEventType.PLAYER_ADDED:
+                meta = event.payload
+                player = Player(meta["name"], meta["color"])
+                game.add_player(player)
+                self._apply_meta(player, meta)
+
+            case LobbyEventType.PLAYER_CHANGED:
+                meta = event.payload
+                self._apply_meta(game._get_player(meta["name"]), meta)
+
+            case LobbyEventType.PLAYER_DELETED:
+                game.remove_player(event.payload["name"])
+
+            case LobbyEventType.STATE_CHANGED:
+                pass # state itself is recorded in every event
+
+        game.state = event.game_state
+        game.order = list(event.turn_order)
+        game.winner = event.winner
+
+
+    def _apply_meta(self, player: Player, meta: dict) -> None:
+        """
+        Makes player match it's recorded meta: color, pending entities and field geometry.
+        """
+        if player.color != meta["color"]:
+            player.colorize(meta["color"])
+        player.pending_entities.update(meta["pending"])
+
+        field = player.field
+        real_cells = tuple(meta["real_cells"])
+        if (
+            field.shape != meta["shape"]
+            or field.dimensions["height"] != meta["height"]
+            or field.dimensions["width"] != meta["width"]
+            or field.useful_cells_coords != real_cells
+        ):
+            player.field = self._rebuild_field(player.name, meta["shape"], meta["height"], meta["width"], real_cells)
+
+
+    @staticmethod
+    def _rebuild_field(name: str, shape: str, height: int, width: int, real_cells: tuple[tuple[int, int], ...]) -> Field:
+        """
+        Restores field from recorded geometry instead of generating it by shape parameters which aren't recorded.
+        """
+        field = Field(name=name)
+        if not real_cells:
+            return field
+
+        void = bytearray(b"\x01") * (height * width)
+        for y, x in real_cells:
+            void[y * width + x] = 0
+        field.stamp_mask(FieldMask(shape, height, width, bytes(void), real_cells))
+        return field
+
+
+    def _place(self, game: Game, event: PlaceEvent) -> None:
+        player = game._get_player(event.player_name)
+
+        if event.entity_type == EntityType.PLANET:
+            position = event.orbit_cells.index(event.anchor) if event.orbit_cells else 0
+            entity = Planet(event.radius or 0, event.orbit_center, event.rotation, position=position)
+            entity.eid = event.entity_id
+            player.field.setup_a_planet(entity)
+        else:
+            entity = Relay() if event.entity_type == EntityType.RELAY else Ship(event.entity_type)
+            entity.eid = event.entity_id
+            player.field.occupy_cells(entity, event.anchor, event.rotation)
+
+        if list(entity.cells_occupied) != list(event.cells_occupied):
+            raise GameException(f"{self}: replay diverged on placing {event.entity_type}-{event.entity_id} of {player}")
+
+        player.add_entity(entity)
+        Entity.reserve_id(entity.eid) # entities created after replay don't reuse recorded ids
+
+
+    def __repr__(self):
+        return f"<{self.id}>"
@@ -0,0 +1,218 @@
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from modules.core.game import Game
+from modules.core.bots import Bot, Hunter
+from modules.core.presets import get_preset
+
+from modules.common.enums import EntityType, GameState, CellStatus
+from modules.common.exceptions import GameException
+from modules.common.zobrist import splitmix64, MASK_64
+
+
+logger = logging.getLogger(__name__)
+
+
+def derive_seed(seed: int, number: int) -> int:
+    """
+    Seed number `number` derived from seed - e.g. of game in tournament or of contestant in game.
+    Seeds are well mixed, so neighbour numbers are unrelated, and any of them can be reproduced by it's number alone.
+    """
+    return splitmix64((splitmix64(seed & MASK_64) + number) & MASK_64) >> 1 # 63 bits - fits any seedable generator
+
+
+@dataclass(frozen=True)
+class Contestant:
+    """
+    One side of simulated game: player options and bot class which plays for it.
+    """
+    name: str
+    shape: str
+    params: tuple
+    entities: dict[EntityType, int]
+    bot: type[Bot] = Hunter
+    color: str = "white"
+
+
+    @classmethod
+    def from_preset(cls, name: str, preset: str, bot: type[Bot] = Hunter, color = "white") -> "Contestant":
+        """
+        "random" preset gives new options on every call.
+        """
+        config = get_preset(preset)
+        return cls(name, config["shape"], tuple(config["params"]), config["entities"], bot, color)
+
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    """
+    Outcome and statistics of one simulated game.
+    winner - player name, "Draw", "Black Hole" or None if game wasn't finished (see reason).
+    """
+    seed: Optional[int]
+    winner: Optional[str]
+    turns: int
+    shots: dict[str, int] # {name: shots made}
+    hits: dict[str, int] # {name: shots which hit opponent's ship, relay or planet}
+    lost_cells: dict[str, int] # {name: cells of player's destroyed ships and relays}
+    duration: float # seconds of setup and play
+    reason: Optional[str] = None # why game wasn't played to the end
+
+
+
+@dataclass
+class SimulationReport:
+    results: list[GameResult] = field(default_factory=list)
+    elapsed: float = 0.0 # seconds
+
+
+    @property
+    def games_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+
+    @property
+    def finished(self) -> list[GameResult]:
+        return [result for result in self.results if result.winner is not None]
+
+
+    @property
+    def wins(self) -> Counter:
+        """
+        {winner: amount of games}, draws and black holes included.
+        """
+        return Counter(result.winner for result in self.finished)
+
+
+    @property
+    def average_turns(self) -> float:
+        finished = self.finished
+        return sum(result.turns for result in finished) / len(finished) if finished else 0.0
+
+
+    def summary(self) -> str:
+        wins = ", ".join(f"{winner}: {amount}" for winner, amount in self.wins.most_common())
+        return (
+            f"{len(self.results)} games ({len(self.finished)} finished) in {self.elapsed:.2f}s - {self.games_per_second:.1f} games/s. "
+            f"Wins: {wins or 'none'}. Average length: {self.average_turns:.1f} turns"
+        )
+
+
+
+class Simulator:
+    """
+    Plays bot against bot directly through Game - no renderer and no terminal.
+    Both players are set up by given options and autoplaced, then bots shoot in turns until the game is over.
+    Seeded game is reproducible: seed is given to global random (bots use it),
+    and every contestant is autoplaced with it's own seed derived from it - same seed would give mirrored presets the same layouts.
+    """
+    def __init__(
+        self,
+        first: Contestant,
+        second: Contestant,
+        *,
+        autoplace_strategy = "backtrack",
+        max_turns: Optional[int] = None,
+    ):
+        if first.name == second.name:
+            raise GameException(f"Contestants must have different names, both are {first.name}")
+
+        self.contestants = (first, second)
+        self.autoplace_strategy = autoplace_strategy
+        self.max_turns = max_turns
+
+
+    def setup(self, seed: Optional[int] = None) -> Game:
+        """
+        Returns game in active state. Raises GameException if players can't be set up.
+        """
+        game = Game("Simulation")
+        for contestant in self.contestants:
+            game.set_player(contestant.name, contestant.color)
+            game.change_player_field(contestant.name, contestant.shape, list(contestant.params))
+            game.change_entity_list(contestant.name, contestant.entities)
+        game.ready()
+
+        for number, contestant in enumerate(self.contestants):
+            game.autoplace(contestant.name, self.autoplace_strategy, None if seed is None else derive_seed(seed, number))
+        game.start() # raises if autoplace didn't place everything
+        return game
+
+
+    def play(self, seed: Optional[int] = None) -> GameResult:
+        """
+        Plays one game to the end.
+        """
+        start = time.perf_counter()
+        if seed is not None:
+            random.seed(seed)
+
+        names = [contestant.name for contestant in self.contestants]
+        shots, hits = dict.fromkeys(names, 0), dict.fromkeys(names, 0)
+
+        try:
+            game = self.setup(seed)
+        except GameException as e:
+            return GameResult(seed, None, 0, shots, hits, dict.fromkeys(names, 0), time.perf_counter() - start, f"Setup failed: {e}")
+
+        bots = {}
+        for contestant, opponent in zip(self.contestants, reversed(self.contestants)):
+            bot = contestant.bot(contestant.name)
+            bot.opponent_field = dict.fromkeys(game.get_player_meta(opponent.name)["real_cells"], CellStatus.FREE)
+            bots[contestant.name] = bot
+
+        reason = None
+        while game.state != GameState.OVER:
+            if self.max_turns is not None and game.turn >= self.max_turns:
+                reason = f"Turns limit {self.max_turns} reached"
+                break
+
+            name = game.whos_turn()
+            opponent = names[1] if name == names[0] else names[0]
+            bot = bots[name]
+
+            coords = bot.shoot()
+            if coords is None:
+                reason = f"{bot} has nothing to shoot"
+                break
+
+            shooter_event, target_event = game.shoot(name, coords)
+            result = target_event.shot_results[coords]
+            shots[name] += 1
+            if result == CellStatus.HIT:
+                hits[name] += 1
+
+            bot.shot_result(coords, result)
+            bot.validate_destruction(target_event.destroyed_cells)
+
+            # opponent's bot watches shooter's field, relays and planets change it too
+            # planets may collide out of field bounds - such cells mean nothing to bot
+            watcher = bots[opponent]
+            for reflected, reflected_result in shooter_event.shot_results.items():
+                if reflected in watcher.opponent_field:
+                    watcher.shot_result(reflected, reflected_result)
+            watcher.validate_destruction(shooter_event.destroyed_cells)
+
+        lost_cells = {name: len(game.get_destroyed_cells(name)) for name in names}
+        return GameResult(seed, game.whos_winner(), game.turn, shots, hits, lost_cells, time.perf_counter() - start, reason)
+
+
+    def run(self, games: int, seed: Optional[int] = 0) -> SimulationReport:
+        """
+        Plays given amount of games one after another. Game i gets seed + i, seed=None - unseeded games.
+        """
+        report = SimulationReport()
+        start = time.perf_counter()
+        for number in range(games):
+            result = self.play(None if seed is None else seed + number)
+            report.results.append(result)
+            if result.reason is not None:
+                logger.info(f"Game {number} (seed {result.seed}) not finished: {result.reason}")
+
+        report.elapsed = time.perf_counter() - start
+        return report
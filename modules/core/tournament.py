@@ -0,0 +1,202 @@
+import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from math import sqrt
+from typing import Optional
+
+from modules.core.simulator import Simulator, GameResult, derive_seed
+
+
+logger = logging.getLogger(__name__)
+
+Z_95 = 1.959963984540054 # normal quantile for 95% confidence intervals
+
+
+def wilson_interval(successes: int, trials: int, z = Z_95) -> tuple[float, float]:
+    """
+    Wilson score interval of success rate. Unlike normal approximation it stays in [0, 1] and works for rates near 0 and 1.
+    """
+    if trials == 0:
+        return (0.0, 1.0)
+
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    margin = z * sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return (max(center - margin, 0.0), min(center + margin, 1.0))
+
+
+
+@dataclass(frozen=True, slots=True)
+class GameRecord:
+    """
+    Compact outcome of one tournament game - what workers send back.
+    winner is None if game wasn't finished.
+    """
+    number: int
+    seed: int
+    winner: Optional[str]
+    turns: int
+    duration: float
+
+
+    @classmethod
+    def from_result(cls, number: int, result: GameResult) -> "GameRecord":
+        return cls(number, result.seed, result.winner, result.turns, result.duration) # type: ignore
+
+
+
+@dataclass
+class TournamentStats:
+    """
+    Running aggregation of game records.
+    """
+    games: int = 0
+    unfinished: int = 0
+    wins: Counter = field(default_factory=Counter) # {winner: games}, draws and black holes included
+    turns: list[int] = field(default_factory=list) # lengths of finished games
+    elapsed: float = 0.0 # seconds
+
+
+    def add(self, record: GameRecord) -> None:
+        self.games += 1
+        if record.winner is None:
+            self.unfinished += 1
+            return
+        self.wins[record.winner] += 1
+        self.turns.append(record.turns)
+
+
+    @property
+    def finished(self) -> int:
+        return self.games - self.unfinished
+
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+
+    def win_rate(self, winner: str) -> tuple[float, float, float]:
+        """
+        Returns (rate, low, high) - share of finished games won by winner and it's 95% confidence interval.
+        """
+        wins, finished = self.wins[winner], self.finished
+        low, high = wilson_interval(wins, finished)
+        return (wins / finished if finished else 0.0, low, high)
+
+
+    def length(self) -> dict:
+        """
+        Statistics of finished games length in turns.
+        """
+        if not self.turns:
+            return {"mean": 0.0, "std": 0.0, "median": 0.0, "min": 0, "max": 0}
+
+        turns = sorted(self.turns)
+        count = len(turns)
+        mean = sum(turns) / count
+        std = sqrt(sum((turn - mean) ** 2 for turn in turns) / (count - 1)) if count > 1 else 0.0
+        middle = count // 2
+        median = turns[middle] if count % 2 else (turns[middle - 1] + turns[middle]) / 2
+        return {"mean": mean, "std": std, "median": median, "min": turns[0], "max": turns[-1]}
+
+
+    def summary(self) -> str:
+        lines = [f"{self.games} games ({self.finished} finished) in {self.elapsed:.2f}s - {self.games_per_second:.1f} games/s"]
+        for winner, _ in self.wins.most_common():
+            rate, low, high = self.win_rate(winner)
+            lines.append(f"  {winner}: {rate:.1%} [{low:.1%}, {high:.1%}]")
+
+        length = self.length()
+        lines.append(f"  length: {length['mean']:.1f} ± {length['std']:.1f} turns, median {length['median']}, {length['min']}-{length['max']}")
+        return "\n".join(lines)
+
+
+
+class Tournament:
+    """
+    Plays many independent games of simulator contestants spread across process pool.
+    Game number i is played with derive_seed(seed, i), so any game is reproducible with play_one(i) regardless of workers amount.
+    Workers get simulator once and then only ranges of game numbers, back they send compact GameRecords.
+    """
+    def __init__(self, simulator: Simulator, seed = 0, *, workers: Optional[int] = None, chunk_size = 16):
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, not {chunk_size}")
+
+        self.simulator = simulator
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+
+    def seed_of(self, number: int) -> int:
+        return derive_seed(self.seed, number)
+
+
+    def play_one(self, number: int) -> GameResult:
+        """
+        Plays game with given number again with full statistics.
+        """
+        return self.simulator.play(self.seed_of(number))
+
+
+    def records(self, games: int, start = 0) -> Iterator[GameRecord]:
+        """
+        Yields records of games with numbers from start to start + games as soon as their chunks are played.
+        Order of chunks depends on workers - sort by number if it matters.
+        """
+        chunks = [(first, min(first + self.chunk_size, start + games)) for first in range(start, start + games, self.chunk_size)]
+
+        if self.workers == 1 or len(chunks) == 1:
+            for first, stop in chunks:
+                yield from _play_chunk(self.simulator, self.seed, first, stop)
+            return
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.simulator,))
+        try:
+            pending = {executor.submit(_play_worker_chunk, self.seed, first, stop) for first, stop in chunks}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+    def run(self, games: int, on_record: Optional[Callable[[GameRecord], None]] = None) -> TournamentStats:
+        """
+        Plays games and aggregates their records. on_record is called for every record as it arrives.
+        """
+        stats = TournamentStats()
+        started = time.perf_counter()
+        for record in self.records(games):
+            stats.add(record)
+            if on_record is not None:
+                on_record(record)
+
+        stats.elapsed = time.perf_counter() - started
+        logger.info(f"Tournament of {games} games on {self.workers} workers finished in {stats.elapsed:.2f}s")
+        return stats
+
+
+
+_worker_simulator: Optional[Simulator] = None # simulator of pool worker process, set by _init_worker
+
+
+def _init_worker(simulator: Simulator) -> None:
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _play_worker_chunk(seed: int, first: int, stop: int) -> list[GameRecord]:
+    return list(_play_chunk(_worker_simulator, seed, first, stop)) # type: ignore
+
+
+def _play_chunk(simulator: Simulator, seed: int, first: int, stop: int) -> Iterator[GameRecord]:
+    for number in range(first, stop):
+        yield GameRecord.from_result(number, simulator.play(derive_seed(seed, number)))
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from modules.core.game import Game
+
+from modules.common.enums import EntityType, GameState
+from modules.common.exceptions import FieldException
+
+
+FLEET = {
+    EntityType.CORVETTE: 4,
+    EntityType.FRIGATE: 3,
+    EntityType.DESTROYER: 2,
+    EntityType.CRUISER: 1,
+    EntityType.RELAY: 2,
+    EntityType.PLANET: 2,
+}
+
+
+def new_game(seed = 0, **kwargs) -> Game:
+    """
+    Active game of players "A" and "B" on 12x12 fields with seeded layouts.
+    """
+    game = Game("Test", **kwargs)
+    for name, color in (("A", "red"), ("B", "blue")):
+        game.set_player(name, color)
+        game.change_player_field(name, "1", [12, 12])
+        game.change_entity_list(name, FLEET)
+    game.ready()
+
+    for number, name in enumerate(("A", "B")):
+        game.autoplace(name, "backtrack", seed * 2 + number)
+    game.start()
+    return game
+
+
+def play(game: Game, seed = 0, shots: int | None = None) -> Game:
+    """
+    Players shoot random cells of each other until game is over or given amount of shots is made.
+    """
+    rng = random.Random(seed)
+    targets = {}
+    for name, opponent in (("A", "B"), ("B", "A")):
+        cells = list(game.get_player_meta(opponent)["real_cells"])
+        rng.shuffle(cells)
+        targets[name] = cells
+
+    made = 0
+    while game.state != GameState.OVER and (shots is None or made < shots):
+        name = game.whos_turn()
+        if not targets[name]:
+            break
+        try:
+            game.shoot(name, targets[name].pop())
+        except FieldException:
+            continue # cell was already shot by reflection
+        made += 1
+    return game
+
+
+def snapshot(game: Game) -> tuple:
+    """
+    Everything observable about game state: two games with equal snapshots play the same from now on.
+    """
+    return (
+        game.turn,
+        game.state,
+        game.winner,
+        tuple(game.order),
+        tuple((game.zobrist(name), game.get_destroyed_cells(name)) for name in game.get_player_names()),
+        tuple(game.events),
+    )
+
+
+@pytest.fixture
+def played_game() -> Game:
+    return play(new_game(seed=3), seed=3)
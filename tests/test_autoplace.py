@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from modules.core.game import Game
+from modules.core.field import Field
+from modules.core.autoplace import LayoutSolver
+
+from modules.common.enums import EntityType
+
+
+FLEET = {EntityType.PLANET: 2, EntityType.CORVETTE: 3, EntityType.FRIGATE: 1, EntityType.RELAY: 2}
+
+
+def autoplaced(strategy: str, seed: int) -> list[tuple]:
+    game = Game("Test")
+    for name in ("A", "B"):
+        game.set_player(name, "white")
+        game.change_player_field(name, "1", [12, 12])
+        game.change_entity_list(name, FLEET)
+    game.ready()
+    game.autoplace("A", strategy, seed)
+
+    entities = game._get_player("A").entities.values()
+    return [(entity.type, entity.anchor, entity.rotation, tuple(entity.cells_occupied)) for entity in entities]
+
+
+@pytest.mark.parametrize("strategy", ["backtrack", "random"])
+def test_seeded_layout_is_reproducible(strategy):
+    random.seed(1)
+    first = autoplaced(strategy, 7)
+    random.seed(2) # global random must not matter
+    assert autoplaced(strategy, 7) == first
+    assert len(first) == sum(FLEET.values())
+
+
+def test_parallel_layout_is_reproducible():
+    field = Field("1", [12, 12])
+    fleet = {EntityType.PLANET: 1, EntityType.CORVETTE: 5, EntityType.FRIGATE: 4, EntityType.DESTROYER: 3, EntityType.CRUISER: 2, EntityType.RELAY: 7}
+    layouts = [LayoutSolver.from_field(field, fleet, seed=5).solve_parallel(3) for _ in range(2)]
+    assert layouts[0] is not None and layouts[0] == layouts[1]
+
+
+def test_single_search_timeout():
+    game = Game("Test")
+    for name in ("A", "B"):
+        game.set_player(name, "white")
+        game.change_player_field(name, "1", [12, 12])
+        game.change_entity_list(name, FLEET)
+    game.ready()
+
+    events, summary = game.autoplace("A", "backtrack", 0, timeout=0.0)
+    assert not events and "timed out" in summary
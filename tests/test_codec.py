@@ -0,0 +1,65 @@
+import io
+
+import pytest
+
+from modules.common.codec import encode_event, decode_event, EventEncoder, EventDecoder
+from modules.common.events import Event, ShotEvent
+from modules.common.enums import CellStatus, EntityType, EventType, GameState
+from modules.common.exceptions import CodecException
+
+
+def test_round_trip(played_game):
+    for event in played_game.events:
+        decoded = decode_event(encode_event(event))
+        assert decoded == event
+        assert repr(decoded) == repr(event) # keeps tuples as tuples and lists as lists
+
+
+def test_round_trip_of_values():
+    event = ShotEvent(
+        game_state=GameState.ACTIVE,
+        event_type=EventType.SHOT,
+        turn=2**40,
+        shooter="Игрок",
+        target="",
+        coords=(-3, 70000),
+        shot_results={(0, 0): CellStatus.MISS, (-1, 5): CellStatus.HIT},
+        planets_anchors=[(1, 2), (-7, -8)],
+        destroyed_cells=[],
+    )
+    decoded = decode_event(encode_event(event))
+    assert decoded == event
+    assert repr(decoded) == repr(event)
+
+
+def test_stream(played_game):
+    events = list(played_game.events)
+    stream = io.BytesIO()
+    written = EventEncoder(stream).write_many(events)
+    assert written == len(stream.getvalue())
+
+    stream.seek(0)
+    assert list(EventDecoder(stream)) == events
+
+
+def test_truncated_stream(played_game):
+    stream = io.BytesIO()
+    EventEncoder(stream).write_many(list(played_game.events)[:3])
+    data = stream.getvalue()
+
+    with pytest.raises(CodecException):
+        list(EventDecoder(io.BytesIO(data[:-1])))
+
+
+def test_unknown_event():
+    with pytest.raises(CodecException):
+        encode_event(Event(GameState.ACTIVE, EventType.SHOT))
+    with pytest.raises(CodecException):
+        decode_event(bytes([255, GameState.ACTIVE.value, EventType.SHOT.value]))
+
+
+def test_records_are_compact(played_game):
+    # places and shots of a 12x12 game take a few dozen bytes, not pickle's hundreds
+    for event in played_game.events:
+        if isinstance(event, ShotEvent) or getattr(event, "entity_type", None) == EntityType.CORVETTE:
+            assert len(encode_event(event)) < 100
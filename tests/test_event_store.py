@@ -0,0 +1,87 @@
+import pytest
+
+from modules.common.event_store import EventStore, MemoryEventStore, ForkEventStore, JournalEventStore
+
+
+def test_event_store_is_abstract():
+    with pytest.raises(TypeError):
+        EventStore() # type: ignore
+
+
+@pytest.mark.parametrize("capacity", [1, 5, 1024])
+def test_journal_keeps_history(played_game, capacity):
+    events = list(played_game.events)
+
+    with JournalEventStore(capacity=capacity) as store:
+        for index, event in enumerate(events):
+            assert store.append(event) == index
+
+        assert len(store) == len(events)
+        assert store.spilled == max(len(events) - capacity, 0)
+        assert list(store) == events
+        assert list(store.range(3, 40)) == events[3:40]
+        assert store[0] == events[0]
+        assert store[-1] == events[-1]
+        assert store[10:20] == events[10:20]
+
+        with pytest.raises(IndexError):
+            store.get(len(events))
+
+
+@pytest.mark.parametrize("capacity", [1, 5, 1024])
+def test_journal_truncate(played_game, capacity):
+    events = list(played_game.events)
+
+    with JournalEventStore(capacity=capacity) as store:
+        for event in events:
+            store.append(event)
+
+        for length in (len(events) - 1, len(events) // 2, 7, 0):
+            store.truncate(length)
+            assert list(store) == events[:length]
+
+            # appending after truncate goes on from the cut
+            for event in events[length:length + 3]:
+                store.append(event)
+            assert list(store) == events[:length + 3]
+            store.truncate(length)
+
+
+def test_journal_file(tmp_path, played_game):
+    events = list(played_game.events)
+    path = tmp_path / "events.journal"
+
+    with JournalEventStore(str(path), capacity=4) as store:
+        for event in events:
+            store.append(event)
+        assert list(store) == events
+    assert path.stat().st_size > 0
+
+
+def test_memory_store():
+    store = MemoryEventStore(["a", "b", "c"]) # type: ignore
+    assert store.append("d") == 3 # type: ignore
+    assert list(store.range(1, 3)) == ["b", "c"]
+    store.truncate(2)
+    assert list(store) == ["a", "b"]
+
+
+def test_fork_store_never_changes_parent():
+    parent = MemoryEventStore(["a", "b", "c"]) # type: ignore
+    fork = ForkEventStore(parent)
+    fork.append("d") # type: ignore
+    assert list(fork) == ["a", "b", "c", "d"]
+
+    fork.truncate(1)
+    fork.append("e") # type: ignore
+    assert list(fork) == ["a", "e"]
+    assert list(parent) == ["a", "b", "c"]
+
+
+def test_fork_store_prefix():
+    parent = MemoryEventStore(["a", "b", "c"]) # type: ignore
+    prefix = ForkEventStore(parent, 2)
+    assert list(prefix) == ["a", "b"]
+    assert prefix.append("x") == 2 # type: ignore
+    assert list(prefix.range(1)) == ["b", "x"]
+    assert len(ForkEventStore(parent, 10)) == 3
@@ -0,0 +1,30 @@
+from modules.core.field import Field
+from modules.core.feasibility import check_fleet
+
+from modules.common.enums import EntityType, FeasibilityStatus
+
+
+def test_planet_orbit_crossing_one_cell():
+    field = Field("1", [1, 2])
+    fleet = {EntityType.PLANET: 1, EntityType.CORVETTE: 1, EntityType.FRIGATE: 0}
+
+    # manual planet may cross the field in a single cell and leave the rest to ships
+    orbits = [
+        ((y, x), radius) for radius in range(1, 6) for y in range(-6, 7) for x in range(-6, 8)
+        if field.clip_orbit((y, x), radius)[1] == 1
+    ]
+    assert orbits
+    assert check_fleet(field, fleet).status != FeasibilityStatus.DOESNT_FIT
+
+
+def test_bounds():
+    field = Field("1", [2, 2])
+    assert check_fleet(field, {EntityType.PLANET: 1, EntityType.CRUISER: 1}).status == FeasibilityStatus.DOESNT_FIT
+    assert check_fleet(field, {EntityType.CORVETTE: 2}).status == FeasibilityStatus.DOESNT_FIT
+    assert check_fleet(Field("1", [10, 10]), {EntityType.CORVETTE: 4, EntityType.CRUISER: 1}).status == FeasibilityStatus.FITS
+
+
+def test_large_field_is_checked_fast():
+    field = Field("1", [100, 100])
+    result = check_fleet(field, {EntityType.PLANET: 1, EntityType.CORVETTE: 3}, exact_time_limit=0.25)
+    assert result.status == FeasibilityStatus.FITS
@@ -0,0 +1,72 @@
+from modules.common.enums import GameState
+
+from conftest import new_game, play, snapshot
+
+
+def test_fork_is_equal():
+    game = play(new_game(seed=2), seed=2, shots=40)
+    assert snapshot(game.fork()) == snapshot(game)
+
+
+def test_fork_is_independent():
+    game = play(new_game(seed=2), seed=2, shots=40)
+    before = snapshot(game)
+
+    fork = play(game.fork(), seed=5)
+    assert fork.state == GameState.OVER
+    assert snapshot(game) == before
+
+    # and the other way round
+    fork = game.fork()
+    forked = snapshot(fork)
+    play(game, seed=6)
+    assert snapshot(fork) == forked
+
+
+def test_fork_plays_like_original():
+    original = play(new_game(seed=4), seed=4, shots=30)
+    fork = original.fork()
+
+    play(original, seed=8)
+    play(fork, seed=8)
+    assert snapshot(fork) == snapshot(original)
+
+
+def test_fork_of_fork():
+    game = play(new_game(seed=2), seed=2, shots=20)
+    fork = play(game.fork(), seed=3, shots=20)
+    second = fork.fork()
+    assert snapshot(second) == snapshot(fork)
+
+    play(second, seed=9)
+    assert len(fork.events) < len(second.events)
+    assert snapshot(game.fork()) == snapshot(game)
+
+
+def test_parent_undo_doesnt_change_fork():
+    game = play(new_game(seed=2, record_undo=True), seed=2, shots=20)
+    fork = game.fork()
+    forked = snapshot(fork)
+
+    game.undo()
+    game.undo()
+    play(game, seed=11, shots=3)
+    assert snapshot(fork) == forked
+
+    # fork's own history goes on from it's fork point
+    play(fork, seed=12, shots=3)
+    assert tuple(fork.events)[:len(forked[-1])] == forked[-1]
+
+
+def test_parent_undo_doesnt_change_fork_of_fork():
+    game = play(new_game(seed=2, record_undo=True), seed=2, shots=20)
+    fork = play(game.fork(), seed=3, shots=2)
+    second = fork.fork()
+    forked = snapshot(second)
+
+    fork.undo()
+    fork.undo()
+    game.undo()
+    play(game, seed=11, shots=2)
+    play(fork, seed=12, shots=2)
+    assert snapshot(second) == forked
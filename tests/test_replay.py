@@ -0,0 +1,97 @@
+import pytest
+
+from modules.core.game import SHOT_REACTION
+from modules.core.replay import Replay
+from modules.core.entities import Entity
+
+from modules.common.event_store import JournalEventStore
+from modules.common.events import ShotEvent
+from modules.common.enums import CellStatus, EntityType
+from modules.common.exceptions import GameException
+
+from conftest import new_game, play, snapshot
+
+
+def shots_of(events) -> list[ShotEvent]:
+    return [event for event in events if isinstance(event, ShotEvent) and event.shooter != SHOT_REACTION]
+
+
+@pytest.mark.parametrize("interval", [1, 7, 100, 10000])
+def test_replay_restores_final_state(played_game, interval):
+    replay = Replay(played_game.events, keyframe_interval=interval)
+    assert snapshot(replay.game) == snapshot(played_game)
+    assert replay.turns == played_game.turn
+
+
+@pytest.mark.parametrize("interval", [3, 50])
+def test_seek_matches_game_played_so_far(played_game, interval):
+    replay = Replay(played_game.events, keyframe_interval=interval)
+    shots = shots_of(played_game.events)
+
+    game = replay.seek(0)
+    for turn in range(0, len(shots) + 1, 37):
+        assert snapshot(replay.seek(turn)) == snapshot(game)
+        for shot in shots[turn:turn + 37]:
+            game.shoot(shot.shooter, shot.coords)
+
+    assert snapshot(replay.seek(10**6)) == snapshot(replay.game)
+    assert snapshot(replay.seek(-5)) == snapshot(replay.seek(0))
+
+
+def test_game_at_is_independent(played_game):
+    replay = Replay(played_game.events, keyframe_interval=20)
+    shots = shots_of(played_game.events)
+    recorded = len(replay.events)
+
+    game = replay.seek(10)
+    for shot in shots[10:20]:
+        game.shoot(shot.shooter, shot.coords)
+
+    assert len(replay.events) == recorded
+    assert snapshot(replay.seek(20)) == snapshot(game)
+    assert replay.seek(10).turn == 10
+
+
+def test_replay_from_journal(played_game):
+    with JournalEventStore(capacity=16) as store:
+        for event in played_game.events:
+            store.append(event)
+
+        replay = Replay(store, keyframe_interval=25)
+        assert snapshot(replay.game) == snapshot(played_game)
+        assert snapshot(replay.seek(100)) == snapshot(Replay(list(played_game.events)).seek(100))
+
+
+def test_replayed_ids_are_reserved(played_game):
+    replay = Replay(played_game.events)
+    eids = [eid for name in replay.game.get_player_names() for eid in replay.game._get_player(name).entities]
+    assert Entity().eid > max(eids)
+
+
+def test_diverged_history():
+    game = play(new_game(seed=1), seed=1, shots=5)
+    events = list(game.events)
+
+    # the same shot recorded with other result
+    last = events[-1]
+    results = {coords: CellStatus.HIT if status == CellStatus.MISS else CellStatus.MISS for coords, status in last.shot_results.items()}
+    events[-1] = ShotEvent(
+        last.game_state, last.event_type, last.turn, last.shooter, last.target, last.coords,
+        results, last.planets_anchors, last.destroyed_cells, # type: ignore
+    )
+    with pytest.raises(GameException):
+        Replay(events)
+
+
+def test_planets_replayed(played_game):
+    replay = Replay(played_game.events)
+    for name in played_game.get_player_names():
+        planets = [
+            (entity.eid, entity.anchor) for entity in played_game._get_player(name).entities.values()
+            if entity.type == EntityType.PLANET
+        ]
+        replayed = [
+            (entity.eid, entity.anchor) for entity in replay.game._get_player(name).entities.values()
+            if entity.type == EntityType.PLANET
+        ]
+        assert planets and replayed == planets
@@ -0,0 +1,68 @@
+import pytest
+
+from modules.core.simulator import Simulator, Contestant, derive_seed
+from modules.core.bots import Randomer, Hunter
+
+from modules.common.enums import EntityType
+from modules.common.exceptions import GameException
+
+
+def simulator(preset = "standart", **kwargs) -> Simulator:
+    return Simulator(Contestant.from_preset("A", preset, Randomer), Contestant.from_preset("B", preset, Hunter), **kwargs)
+
+
+def layout(game, name: str) -> set:
+    return {(entity.type, tuple(entity.cells_occupied)) for entity in game._get_player(name).entities.values() if entity.type != EntityType.PLANET}
+
+
+def test_names_must_differ():
+    with pytest.raises(GameException):
+        Simulator(Contestant.from_preset("A", "classic"), Contestant.from_preset("A", "classic"))
+
+
+def test_mirrored_contestants_get_own_layouts():
+    game = simulator().setup(0)
+    assert layout(game, "A") != layout(game, "B")
+
+
+def test_mirrored_games_are_not_all_black_holes():
+    report = simulator().run(20, seed=0)
+    assert len(report.finished) == 20
+    assert report.wins["Black Hole"] < 20
+    assert report.wins["B"] > 0
+
+
+def test_seeded_games_are_reproducible():
+    sim = simulator()
+    first, second = sim.play(7), sim.play(7)
+    assert (first.winner, first.turns, first.shots, first.hits, first.lost_cells) == (second.winner, second.turns, second.shots, second.hits, second.lost_cells)
+
+
+def test_result_statistics():
+    result = simulator("classic").play(1)
+    assert result.winner in ("A", "B", "Draw")
+    assert result.reason is None
+    assert sum(result.shots.values()) == result.turns
+    assert all(result.hits[name] <= result.shots[name] for name in ("A", "B"))
+    assert max(result.lost_cells.values()) == 20 # classic fleet of the loser is destroyed
+
+
+def test_turns_limit():
+    result = simulator("classic", max_turns=10).play(1)
+    assert result.winner is None
+    assert result.turns == 10
+    assert "limit" in result.reason # type: ignore
+
+
+def test_setup_failure_is_reported():
+    crowded = Contestant("A", "1", (3, 3), {EntityType.CRUISER: 5}, Randomer)
+    result = Simulator(crowded, Contestant.from_preset("B", "classic")).play(0)
+    assert result.winner is None
+    assert result.reason.startswith("Setup failed") # type: ignore
+
+
+def test_derive_seed():
+    seeds = {derive_seed(0, number) for number in range(1000)}
+    assert len(seeds) == 1000
+    assert all(0 <= seed < 1 << 63 for seed in seeds)
+    assert derive_seed(1, 0) != derive_seed(0, 1)
@@ -0,0 +1,53 @@
+import pytest
+
+from modules.core.simulator import Simulator, Contestant
+from modules.core.tournament import Tournament, TournamentStats, GameRecord, wilson_interval
+from modules.core.bots import Randomer, Hunter
+
+
+@pytest.fixture(scope="module")
+def simulator() -> Simulator:
+    return Simulator(Contestant.from_preset("A", "standart", Randomer), Contestant.from_preset("B", "standart", Hunter))
+
+
+def test_play_one_reproduces_run(simulator):
+    tournament = Tournament(simulator, seed=42, workers=1, chunk_size=3)
+    records = sorted(tournament.records(10), key=lambda record: record.number)
+    assert [record.number for record in records] == list(range(10))
+
+    stats = tournament.run(10)
+    assert stats.wins["Black Hole"] < 10
+
+    for record in records:
+        result = tournament.play_one(record.number)
+        assert (result.seed, result.winner, result.turns) == (record.seed, record.winner, record.turns)
+
+
+def test_workers_give_the_same_records(simulator):
+    single = sorted(Tournament(simulator, seed=5, workers=1, chunk_size=2).records(6), key=lambda record: record.number)
+    pooled = sorted(Tournament(simulator, seed=5, workers=2, chunk_size=2).records(6), key=lambda record: record.number)
+    assert [(r.seed, r.winner, r.turns) for r in single] == [(r.seed, r.winner, r.turns) for r in pooled]
+
+
+def test_stats():
+    stats = TournamentStats()
+    for number, (winner, turns) in enumerate((("A", 10), ("B", 20), ("A", 30), (None, 5))):
+        stats.add(GameRecord(number, number, winner, turns, 0.1))
+
+    assert (stats.games, stats.finished, stats.unfinished) == (4, 3, 1)
+    rate, low, high = stats.win_rate("A")
+    assert rate == pytest.approx(2 / 3) and low < rate < high
+    assert stats.length() == {"mean": 20.0, "std": 10.0, "median": 20, "min": 10, "max": 30}
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(0, 10)
+    assert low == 0.0 and 0 < high < 0.35
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(1 - high)
+
+
+def test_chunk_size_must_be_positive(simulator):
+    with pytest.raises(ValueError):
+        Tournament(simulator, chunk_size=0)
@@ -0,0 +1,87 @@
+import pytest
+
+from modules.common.event_store import JournalEventStore
+from modules.common.enums import GameState
+from modules.common.exceptions import GameException
+
+from conftest import new_game, play, snapshot
+
+
+def play_recording(game, seed: int) -> list[tuple]:
+    """
+    Plays game to the end and returns snapshots before every shot and after the last one.
+    """
+    snapshots = [snapshot(game)]
+    while game.state != GameState.OVER:
+        events = len(game.events)
+        play(game, seed=seed + len(snapshots), shots=1)
+        if len(game.events) == events: # nothing left to shoot
+            break
+        snapshots.append(snapshot(game))
+    return snapshots
+
+
+def test_undo_is_off_by_default():
+    game = play(new_game(seed=1), seed=1, shots=10)
+    assert not game._undo
+    with pytest.raises(GameException, match="record_undo"):
+        game.undo()
+
+
+@pytest.mark.parametrize("capacity", [None, 4])
+def test_undo_restores_every_state(capacity):
+    store = JournalEventStore(capacity=capacity) if capacity else None
+    game = new_game(seed=5, event_store=store, record_undo=True)
+    snapshots = play_recording(game, seed=5)
+    assert game.state == GameState.OVER
+
+    for expected in reversed(snapshots[:-1]):
+        game.undo()
+        assert snapshot(game) == expected
+
+    with pytest.raises(GameException):
+        game.undo()
+    if store is not None:
+        store.close()
+
+
+def test_undo_and_replay_again():
+    game = new_game(seed=6, record_undo=True)
+    snapshots = play_recording(game, seed=6)
+
+    for _ in range(len(snapshots) // 2):
+        game.undo()
+    play_recording(game, seed=6 + len(snapshots) // 2) # other shots from here on
+    while game._undo:
+        game.undo()
+    assert snapshot(game) == snapshots[0]
+
+
+def test_undo_only_recorded_shots():
+    game = play(new_game(seed=7), seed=7, shots=10)
+    before = snapshot(game)
+
+    game.record_undo = True
+    play(game, seed=8, shots=3)
+    for _ in range(3):
+        game.undo()
+    assert snapshot(game) == before
+    with pytest.raises(GameException):
+        game.undo()
+
+
+def test_undo_in_fork():
+    game = play(new_game(seed=2, record_undo=True), seed=2, shots=30)
+    before = snapshot(game)
+
+    fork = game.fork()
+    assert fork.record_undo
+    with pytest.raises(GameException):
+        fork.undo() # records of original point to it's own objects
+
+    forked = snapshot(fork)
+    play(fork, seed=3, shots=10)
+    for _ in range(10):
+        fork.undo()
+    assert snapshot(fork) == forked
+    assert snapshot(game) == before
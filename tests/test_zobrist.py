@@ -0,0 +1,114 @@
+import pytest
+
+from modules.common.cache import TranspositionTable
+from modules.common.zobrist import zobrist_key, rotate_left, MASK_64
+from modules.common.enums import CellStatus
+
+from conftest import new_game, play
+
+
+def hashes(game) -> tuple[int, int]:
+    return (game.zobrist("A"), game.zobrist("B"))
+
+
+def free_cells(game, name: str) -> list[tuple[int, int]]:
+    """
+    Cells of player's field which no entity or planet orbit takes - shots there are plain misses.
+    """
+    player = game._get_player(name)
+    taken = {coords for entity in player.entities.values() for coords in entity.cells_occupied}
+    return [coords for coords in game.get_player_meta(name)["real_cells"] if coords not in taken]
+
+
+def test_keys():
+    key = zobrist_key(CellStatus.MISS, (3, 4))
+    assert key == zobrist_key(CellStatus.MISS, (3, 4))
+    assert 0 <= key <= MASK_64
+    assert len({zobrist_key(status, (y, x)) for status in CellStatus for y in range(-2, 12) for x in range(12)}) == len(CellStatus) * 14 * 12
+    assert rotate_left(rotate_left(key, 63)) == key
+
+
+def test_hash_changes_with_position():
+    game = new_game(seed=1)
+    seen = {hashes(game)}
+    for _ in range(30):
+        play(game, seed=len(seen), shots=1)
+        current = hashes(game)
+        assert current[0] != current[1]
+        assert current not in seen
+        seen.add(current)
+
+
+def test_transposition():
+    first, second = new_game(seed=2), new_game(seed=2)
+    a_targets, b_targets = free_cells(first, "B")[:2], free_cells(first, "A")[:2]
+
+    # the same misses in other order lead to the same position
+    for game, order in ((first, (0, 1)), (second, (1, 0))):
+        for index in order:
+            game.shoot("A", a_targets[index])
+            game.shoot("B", b_targets[index])
+
+    assert hashes(first) == hashes(second)
+
+
+def test_hash_follows_fork_and_undo():
+    game = play(new_game(seed=3, record_undo=True), seed=3, shots=20)
+    history = [hashes(game)]
+    for _ in range(15):
+        play(game, seed=len(history), shots=1)
+        history.append(hashes(game))
+
+    assert hashes(game.fork()) == history[-1]
+    for expected in reversed(history[:-1]):
+        game.undo()
+        assert hashes(game) == expected
+
+
+def test_table():
+    table = TranspositionTable(size=5)
+    assert table.slots == 8
+
+    assert table.put(1, "one", depth=2)
+    assert table.get(1) == "one"
+    assert table.get(1, depth=3) is None # searched not deep enough
+    assert table.get(9, default="none") == "none" # same slot, other position
+    assert 1 in table and 9 not in table
+
+    assert not table.put(9, "nine", depth=1) # shallower result doesn't evict deeper one
+    assert table.put(9, "nine", depth=2)
+    assert table.get(9) == "nine" and table.get(1) is None
+    assert len(table) == 1
+
+    table.clear()
+    assert len(table) == 0 and table.get(9) is None
+
+
+def test_table_always_policy():
+    table = TranspositionTable(size=8, policy="always")
+    table.put(1, "one", depth=5)
+    assert table.put(9, "nine", depth=0)
+    assert table.get(9) == "nine"
+    assert table.evictions == 1
+
+
+def test_table_arguments():
+    with pytest.raises(ValueError):
+        TranspositionTable(size=0)
+    with pytest.raises(ValueError):
+        TranspositionTable(policy="never")
+
+
+def test_opponents_dont_cancel_out():
+    game = new_game(seed=4)
+    play(game, seed=4, shots=10)
+
+    # the second opponent with exactly the same facts as the first one
+    twin = game._get_player("B").fork()
+    twin.name = "C"
+    game.add_player(twin)
+    both = game.zobrist("A")
+
+    game.remove_player("B")
+    game.remove_player("C")
+    assert game.zobrist("A") != both